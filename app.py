@@ -1,20 +1,29 @@
 import streamlit as st
+from asset_manifest import get_manifest, watch_assets, asset_entry, room_images, display_path
+_logo = asset_entry("logo.png")
 st.set_page_config(
     page_title="Hotel Quinto • Assistant",
-    page_icon="assets/logo.png",
+    page_icon=display_path(_logo) if _logo else "assets/logo.png",
     layout="wide",
     initial_sidebar_state="expanded"
 )
 
 from openai import OpenAI  # <-- ADD THIS LINE
 
-from settings import USD_RATE, WHATSAPP_E164, CHECKIN, CHECKOUT, ACCEPTED_PAYMENTS, PROMOS
+import settings
 from datetime import datetime, date, timedelta
 from urllib.parse import quote_plus
-from pathlib import Path
-import requests
+from html import escape
 import os
-from dotenv import load_dotenv
+from rooms import BASE_DIR, ASSETS, ROOMS_DATA, match_rooms_from_text, room_caption
+from places import HOTEL_LAT, HOTEL_LON
+from chat_pipeline import answer_chat, set_answer_cache, get_openai_client, ANSWER_CACHE_SIZE, FALLBACK_REPLY
+from shared_cache import get_cache
+from fx import fetch_usd_to_cop, usd_to_cop
+from model_policy import policy as model_policy
+from availability import get_store as get_availability_store
+import warmup
+import llm_metrics
 
 # ──────────────────────────────────────────────────────────────────────────
 # Booking summary card renderer for Streamlit
@@ -30,7 +39,7 @@ def render_booking_card(
     cop_per_person=None,
     asof_str=None,
 ):
-    usd_per_person = float(usd_per_person) if usd_per_person is not None else float(USD_RATE)
+    usd_per_person = float(usd_per_person) if usd_per_person is not None else float(S.USD_RATE)
     try:
         guests = int(guests)
         nights = int(nights)
@@ -117,68 +126,43 @@ def format_booking_price_text(
 """
 Streamlit Chatbot for Hotel Quinto (refactored)
 Run:
-    streamlit run app.py
+    python warmup.py serve    # warms up first, then starts Streamlit (see warmup.py)
 """
 
 
 # ──────────────────────────────────────────────────────────────────────────
 # Config & constants
 # ──────────────────────────────────────────────────────────────────────────
-load_dotenv()
+# .env is loaded by settings (imported above), after it records the real environment
 
-
-BASE_DIR = Path(__file__).parent
-ASSETS = BASE_DIR / "assets"
 ASSETS.mkdir(parents=True, exist_ok=True)
-HOTEL_LAT, HOTEL_LON = 4.57898411319599, -75.73419087522693
-
-
-
-# Room data (all paths as lists for consistency)
-ROOMS_DATA = [
-    {
-        "key": "standard",
-        "keywords": ["standard", "estandar", "estándar", "single"],
-        "paths": [str(ASSETS / "standard.jpg"), str(ASSETS / "standard2.jpg")],
-        "caption_en": "Standard — 1 double bed, bamboo style, bathroom across the hall",
-        "caption_es": "Estándar — 1 cama doble, estilo bambú, baño al frente",
-        "capacity": 2,
-    },
-    {
-        "key": "downstairs",
-        "keywords": ["downstairs", "abajo"],
-        "paths": [str(ASSETS / "stairs-bedroom-downstairs.jpg")],
-        "caption_en": "Downstairs Bedroom — Cozy room on the lower floor",
-        "caption_es": "Habitación de abajo — Habitación acogedora en la planta baja",
-        "capacity": 3,
-    },
-    {
-        "key": "upstairs",
-        "keywords": ["upstairs", "arriba"],
-        "paths": [str(ASSETS / "upstairs-bedroom.jpg")],
-        "caption_en": "Upstairs Room — Bright with views",
-        "caption_es": "Habitación de arriba — Luminosa con vistas",
-        "capacity": 3,
-    },
-    {
-        "key": "threebed",
-        "keywords": ["three", "triple", "tres"],
-        "paths": [str(ASSETS / "three-bed-room.jpg")],
-        "caption_en": "Three-Bedroom — Spacious with multiple beds",
-        "caption_es": "Habitación triple — Amplia con varias camas",
-        "capacity": 4,
-    },
-    {
-        "key": "fourbed",
-        "keywords": ["four", "cuatro", "quad"],
-        "paths": [str(ASSETS / "four-bed.jpg")],
-        "caption_en": "Four-Bedroom — Large with room for groups",
-        "caption_es": "Habitación de cuatro camas — Grande para grupos",
-        "capacity": 5,
-    },
-]
+get_manifest()
+watch_assets()
+
+# One settings snapshot per rerun; editing .env / SETTINGS_FILE takes effect on the next one
+settings.watch()
+S = settings.current()
+set_answer_cache(
+    get_cache("answers", S.CACHE_BACKEND, S.CACHE_PATH, max_entries=ANSWER_CACHE_SIZE),
+    ttl=S.ANSWER_CACHE_TTL_SECONDS,
+    # Answers depend on which models produce them
+    context=S.fingerprint("MODEL_TIERS"),
+)
+if S.MODEL_TIERS:
+    model_policy.configure(S.MODEL_TIERS)
+availability = get_availability_store(BASE_DIR / S.AVAILABILITY_DB)
+has_availability = availability.version() > 0
+llm_metrics.metrics.configure(S.MODEL_PRICES)
+if S.METRICS_PATH:
+    llm_metrics.export_to_file(BASE_DIR / S.METRICS_PATH, S.METRICS_INTERVAL_SECONDS)
+if S.METRICS_PORT:
+    llm_metrics.serve(S.METRICS_PORT)
+# No-op after `python warmup.py serve` (the start command); under plain `streamlit run`
+# the first session starts it, so /ready has to be served from here too
+warmup.start()
+if S.READY_PORT:
+    warmup.serve_readiness(S.READY_PORT)
 
-ROOM_GENERIC_TRIGGERS = ["room", "rooms", "habitacion", "habitaciones"]
 
 T = {
     "English": {
@@ -207,6 +191,8 @@ T = {
         "rate_source": "Rate source: 1 USD ≈ {cop:,} COP (as of {asof}).",
         "price_info": "Base: USD ${usd} (~{cop_ppn:,} COP) per person/night. Estimated total: USD ${total_usd:.2f} (~{total_cop:,} COP) for {guests} guest(s), {nights} night(s). ",
         "discount_applied": "Discount applied: {disc}%",
+        "rooms_free": "Available for your dates: {rooms}",
+        "rooms_none": "No single room for {guests} guest(s) is free on these dates. Message us on WhatsApp and we'll find an option.",
     },
     "Español": {
         "title": "Hotel Quinto • Asistente de Huéspedes",
@@ -234,6 +220,8 @@ T = {
         "rate_source": "Fuente: 1 USD ≈ {cop:,} COP (al {asof}).",
         "price_info": "Tarifa base: USD ${usd} (~{cop_ppn:,} COP) por persona/noche. Total estimado: USD ${total_usd:.2f} (~{total_cop:,} COP) para {guests} huésped(es), {nights} noche(s). ",
         "discount_applied": "Descuento aplicado: {disc}%",
+        "rooms_free": "Disponibles para tus fechas: {rooms}",
+        "rooms_none": "No hay una habitación libre para {guests} huésped(es) en esas fechas. Escríbenos por WhatsApp y buscamos una opción.",
     },
 }
 
@@ -241,69 +229,6 @@ T = {
 # Helpers
 # ──────────────────────────────────────────────────────────────────────────
 
-def match_rooms_from_text(text: str):
-    t = (text or "").lower()
-    matched = [r for r in ROOMS_DATA if any(k in t for k in r["keywords"])]
-    if matched:
-        return matched
-    if any(k in t for k in ROOM_GENERIC_TRIGGERS):
-        return ROOMS_DATA
-    return []
-
-
-def room_caption(r, lang: str) -> str:
-    return r["caption_es"] if lang == "Español" else r["caption_en"]
-
-
-def fetch_usd_to_cop():
-    """Fetch today's USD->COP rate. Returns (rate_float, as_of_text). Fallback if offline."""
-    try:
-        r = requests.get("https://open.er-api.com/v6/latest/USD", timeout=6)
-        if r.ok:
-            data = r.json()
-            rate = float(data["rates"]["COP"])
-            as_of = data.get("time_last_update_utc", "today")
-            return rate, as_of
-    except Exception:
-        pass
-    return 3894.0, "approx (fallback)"
-
-# New: USD to COP conversion using exchangerate.host
-def usd_to_cop(amount_usd: float, default_rate: float = 4000.0):
-    """
-    Convert USD to COP using the latest exchange rate from exchangerate.host.
-    Returns (converted_amount, rate_used).
-    If the API fails, uses default_rate.
-    """
-    url = "https://api.exchangerate.host/latest?base=USD&symbols=COP"
-    try:
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-        rate = data["rates"]["COP"]
-    except Exception:
-        rate = default_rate
-    converted = amount_usd * rate
-    return converted, rate
-
-# New: COP to USD conversion using the same rate
-def cop_to_usd(amount_cop: float, default_rate: float = 4000.0):
-    """
-    Convert COP to USD using the latest exchange rate from exchangerate.host.
-    Returns (converted_amount, rate_used).
-    If the API fails, uses default_rate.
-    """
-    url = "https://api.exchangerate.host/latest?base=USD&symbols=COP"
-    try:
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-        rate = data["rates"]["COP"]
-    except Exception:
-        rate = default_rate
-    converted = amount_cop / rate
-    return converted, rate
-
 def build_whatsapp_url(name, ci, co, guests, room_label, lang):
     if lang == "Español":
         pay = "Confirmo que el pago es en efectivo (COP) o transferencia bancaria (sin tarjetas)."
@@ -313,50 +238,31 @@ def build_whatsapp_url(name, ci, co, guests, room_label, lang):
         pay = "I acknowledge payments are Cash (COP) or bank transfer only (no cards)."
         prefix = "Hello Hotel Quinto! I'd like to check availability for:"
         msg = f"{prefix} {room_label}. Name: {name}. Check-in: {ci} Check-out: {co}. Guests: {guests}. {pay}"
-    return f"https://wa.me/{WHATSAPP_E164}?text={quote_plus(msg)}"
-
-SYSTEM_PROMPT = (
-    "You are the Hotel Quinto assistant. Be concise, friendly, bilingual when needed, "
-    "and respect policies: payments are cash (COP) or bank transfer only. "
-    "If asked for the address or location, reply with: 'Hotel Quinto is located at Vereda La Frontera, Circasia, Quindío, Colombia. "
-    "You can find us on Google Maps here: https://www.google.com/maps/search/?api=1&query=Hotel+Quinto,+Montenegro+-+Circasia+Vereda+La+Frontera,+Montenegro,+Quindío,+Colombia "
-    "Always provide helpful tips and a welcoming tone."
-)
+    return f"https://wa.me/{S.WHATSAPP_E164}?text={quote_plus(msg)}"
 
 # ──────────────────────────────────────────────────────────────────────────
 # UI
 # ──────────────────────────────────────────────────────────────────────────
 
+def static_image_html(entry, caption):
+    # Browser fetches the content-hashed file from /app/static/ and caches it
+    return (
+        f'<figure style="margin:0 0 1em 0;">'
+        f'<img src="{entry["url"]}" alt="{escape(caption)}" loading="lazy" '
+        f'width="{entry.get("web_width", "")}" height="{entry.get("web_height", "")}" '
+        f'style="width:100%; height:auto; border-radius:8px;"/>'
+        f'<figcaption style="text-align:center; color:gray; font-size:0.9em;">{escape(caption)}</figcaption>'
+        f'</figure>'
+    )
+
 def show_room_images(room, lang):
-    from PIL import Image, ExifTags
-    for path in room.get("paths", []):
-        if not path:
-            continue
-        p = Path(path)
-        if p.exists():
-            try:
-                img = Image.open(str(p))
-                # Auto-orient using EXIF
-                try:
-                    for orientation in ExifTags.TAGS.keys():
-                        if ExifTags.TAGS[orientation] == 'Orientation':
-                            break
-                    exif = img._getexif()
-                    if exif is not None:
-                        orientation_value = exif.get(orientation, None)
-                        if orientation_value == 3:
-                            img = img.rotate(180, expand=True)
-                        elif orientation_value == 6:
-                            img = img.rotate(270, expand=True)
-                        elif orientation_value == 8:
-                            img = img.rotate(90, expand=True)
-                except Exception:
-                    pass
-                st.image(img, caption=room_caption(room, lang), use_container_width=True)
-            except Exception:
-                st.warning(f"⚠️ Could not load image: {p.name}")
+    # Paths, orientation and existence come from the startup-built asset manifest
+    caption = room_caption(room, lang)
+    for entry in room_images(room):
+        if S.SERVE_STATIC_IMAGES and entry.get("url"):
+            st.markdown(static_image_html(entry, caption), unsafe_allow_html=True)
         else:
-            st.warning(f"⚠️ Image not found: {p.name}")
+            st.image(display_path(entry), caption=caption, use_container_width=True)
 
 def sidebar_ui():
     st.sidebar.markdown("---")
@@ -365,7 +271,7 @@ def sidebar_ui():
         fx_rate = st.session_state.get("fx_rate", 4000.0)
         now = datetime.now()
         summary = format_booking_price_text(
-            usd_per_person=USD_RATE,
+            usd_per_person=S.USD_RATE,
             guests=guests,
             nights=(co - ci).days if isinstance(co, date) and isinstance(ci, date) else 1,
             fx_rate_usd_to_cop=fx_rate,
@@ -399,7 +305,7 @@ def currency_converter_ui():
         st.session_state["fx_rate"] = live_rate
         st.session_state["fx_rate_time"] = None
     if st.sidebar.button("🔄 Refresh Rate"):
-        _, live_rate = usd_to_cop(1.0)
+        _, live_rate = usd_to_cop(1.0, refresh=True)
         st.session_state["fx_rate"] = live_rate
         st.session_state["fx_rate_time"] = None
     conversion_type = st.sidebar.radio("Direction / Dirección", ["USD → COP", "COP → USD"], index=0)
@@ -434,10 +340,10 @@ def main_ui():
         st.subheader(TXT.get("contact_title", "Contact"))
         contact_md = (
             f"**WhatsApp:** [{TXT.get('whatsapp', 'WhatsApp')}]"
-            f"(https://wa.me/{WHATSAPP_E164})\n\n"
-            f"**Check-in:** {CHECKIN}  \n"
-            f"**Check-out:** {CHECKOUT}  \n"
-            f"**Payments:** {ACCEPTED_PAYMENTS}"
+            f"(https://wa.me/{S.WHATSAPP_E164})\n\n"
+            f"**Check-in:** {S.CHECKIN}  \n"
+            f"**Check-out:** {S.CHECKOUT}  \n"
+            f"**Payments:** {', '.join(S.ACCEPTED_PAYMENTS)}"
         )
         st.markdown(contact_md)
         st.markdown("---")
@@ -450,7 +356,7 @@ def main_ui():
                 return 5
             return 0
         disc_group = group_discount(int(guests))
-        disc_promo = PROMOS.get(promo_code, 0)
+        disc_promo = S.PROMOS.get(promo_code, 0)
         applied_disc = max(disc_group, disc_promo)
         if applied_disc > 0:
             if LANG == "Español":
@@ -468,14 +374,14 @@ def main_ui():
             )
         else:
             CURRENT_CONV, AS_OF = fetch_usd_to_cop()
-            cop_ppn = int(USD_RATE * CURRENT_CONV)
-            total_usd = USD_RATE * guests * nights
+            cop_ppn = int(S.USD_RATE * CURRENT_CONV)
+            total_usd = S.USD_RATE * guests * nights
             total_cop = cop_ppn * guests * nights
             if applied_disc > 0:
                 total_usd *= (1 - applied_disc / 100)
                 total_cop = int(total_cop * (1 - applied_disc / 100))
             info_text = TXT.get("price_info", "").format(
-                usd=int(USD_RATE),
+                usd=int(S.USD_RATE),
                 cop_ppn=cop_ppn,
                 total_usd=total_usd,
                 total_cop=total_cop,
@@ -486,6 +392,14 @@ def main_ui():
                 info_text += TXT.get("discount_applied", "").format(disc=applied_disc) + " • "
             info_text += TXT.get("rate_source", "").format(cop=int(CURRENT_CONV), asof=AS_OF)
             st.info(info_text)
+            # Without any loaded blocks we know nothing about availability: WhatsApp only
+            if has_availability:
+                free_rooms = availability.available_rooms(ci, co, int(guests))
+                if free_rooms:
+                    names = ", ".join(room_caption(r, LANG).split(" — ")[0] for r in free_rooms)
+                    st.success(TXT.get("rooms_free", "").format(rooms=names))
+                else:
+                    st.warning(TXT.get("rooms_none", "").format(guests=int(guests)))
             if LANG == "Español":
                 pre = "¡Hola Hotel Quinto! Quiero consultar disponibilidad."
                 pay = "Confirmo pago en efectivo (COP) o transferencia bancaria (sin tarjetas)."
@@ -498,7 +412,7 @@ def main_ui():
                 disc_txt = f" Discount applied: {applied_disc}%" if applied_disc > 0 else ""
                 nights_txt = f" Stay: {nights} night(s)."
                 msg = f"{pre} Name: {name_in}. Check-in: {ci} Check-out: {co}. Guests: {int(guests)}.{nights_txt}.{disc_txt}"
-            wa_url = f"https://wa.me/{WHATSAPP_E164}?text={quote_plus(msg + ' ' + pay)}"
+            wa_url = f"https://wa.me/{S.WHATSAPP_E164}?text={quote_plus(msg + ' ' + pay)}"
             try:
                 st.link_button(TXT.get("booking_button", "Send on WhatsApp"), wa_url, use_container_width=True)
             except Exception:
@@ -506,7 +420,11 @@ def main_ui():
         st.markdown("---")
         st.subheader("Rooms & Photos / Habitaciones & Fotos")
         min_cap = st.slider(TXT.get("min_capacity", "Minimum capacity"), min_value=1, max_value=8, value=1)
-        filtered_rooms = [r for r in ROOMS_DATA if r.get("capacity", 1) >= min_cap]
+        if nights > 0 and has_availability:
+            # Only rooms that fit and are free for the sidebar dates
+            filtered_rooms = availability.available_rooms(ci, co, min_cap)
+        else:
+            filtered_rooms = [r for r in ROOMS_DATA if r.get("capacity", 1) >= min_cap]
         for r in filtered_rooms:
             show_room_images(r, LANG)
         if filtered_rooms:
@@ -566,21 +484,20 @@ def main_ui():
             st.session_state["messages"].append({"role": "user", "content": user_msg})
             api_key = os.getenv("OPENAI_API_KEY", "").strip()
             if not api_key or OpenAI is None:
-                reply = "Thanks! Share dates via WhatsApp or click a room to ask about availability."
+                # Place questions are still answered locally; anything else gets the WhatsApp fallback
+                result = answer_chat(st.session_state["messages"], LANG, None)
+                reply = result["answer"]
                 st.chat_message("assistant").markdown(reply)
                 st.session_state["messages"].append({"role": "assistant", "content": reply})
             else:
-                client = OpenAI()
-                convo = [{"role": "system", "content": SYSTEM_PROMPT}] + st.session_state["messages"]
+                client = get_openai_client()
                 with st.chat_message("assistant"):
                     with st.spinner("Thinking…"):
-                        resp = client.chat.completions.create(
-                            model="gpt-4o-mini",
-                            messages=convo,
-                            temperature=0.4,
-                            max_tokens=700,
-                        )
-                        answer = resp.choices[0].message.content
+                        try:
+                            answer = answer_chat(st.session_state["messages"], LANG, client)["answer"]
+                        except Exception:
+                            # Upstream error or in-flight timeout (already counted in llm_metrics)
+                            answer = FALLBACK_REPLY
                         st.markdown(answer)
                         st.session_state["messages"].append({"role": "assistant", "content": answer})
                         for r in match_rooms_from_text(answer):
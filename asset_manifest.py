@@ -0,0 +1,274 @@
+"""
+Asset manifest for Hotel Quinto.
+
+Built from ROOMS_DATA (plus the logo/coffee artwork) once at startup or with
+    python asset_manifest.py --build
+Each file gets size, sha256, display dimensions, EXIF orientation and a
+pre-oriented, downscaled "web" derivative under assets/derived/. Renderers
+read the in-memory manifest only; it is rebuilt when assets/ changes.
+
+Derivatives are also published to static/img/ under content-hashed names so
+Streamlit's static serving (server.enableStaticServing) can hand them to the
+browser by URL with long-lived cache headers.
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+from file_watch import watch_paths
+from rooms import BASE_DIR, ASSETS, ROOMS_DATA
+
+MANIFEST_PATH = ASSETS / "manifest.json"
+DERIVED_DIR = ASSETS / "derived"
+MANIFEST_VERSION = 2
+
+# Streamlit serves <app dir>/static/* at /app/static/*
+STATIC_DIR = BASE_DIR / "static"
+STATIC_IMG_DIR = STATIC_DIR / "img"
+STATIC_URL_PREFIX = "app/static/img"
+
+# Non-room artwork the UI also shows
+EXTRA_ASSETS = ["logo.png", "coffee.png"]
+
+# At most Streamlit's content width (MAXIMUM_CONTENT_WIDTH, 1460 px): st.image() resizes
+# and re-encodes anything wider on every render
+WEB_MAX_PX = 1460
+WEB_JPEG_QUALITY = 85
+
+_lock = threading.Lock()
+_manifest = None
+_stale = True
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Build
+# ──────────────────────────────────────────────────────────────────────────
+def _rel(p: Path) -> str:
+    return p.relative_to(BASE_DIR).as_posix()
+
+
+def assets_signature() -> list:
+    """(name, size, mtime_ns) for every source file in assets/; cheap change detector."""
+    sig = []
+    for entry in sorted(os.scandir(ASSETS), key=lambda e: e.name):
+        if entry.is_file() and entry.name != MANIFEST_PATH.name:
+            st_ = entry.stat()
+            sig.append([entry.name, st_.st_size, st_.st_mtime_ns])
+    return sig
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _describe(path: Path) -> dict:
+    entry = {"name": path.name, "path": _rel(path), "exists": path.is_file()}
+    if not entry["exists"]:
+        return entry
+    from PIL import Image, ImageOps
+
+    entry["size"] = path.stat().st_size
+    entry["sha256"] = _sha256(path)
+    entry["derivatives"] = {}
+    try:
+        with Image.open(path) as img:
+            entry["orientation"] = int(img.getexif().get(0x0112, 1))  # EXIF Orientation tag
+            img = ImageOps.exif_transpose(img)
+            entry["width"], entry["height"] = img.size
+            web, entry["web_width"], entry["web_height"] = _write_web_derivative(img, path, entry["sha256"])
+            entry["derivatives"]["web"] = web
+    except Exception as e:
+        entry["error"] = str(e)
+    return entry
+
+
+def _write_web_derivative(img, src: Path, sha: str):
+    """Oriented, downscaled copy named by content hash and size limit (skipped if
+    already on disk). Saved as JPEG unless the source has transparency.
+    Returns (relative path, width, height)."""
+    from PIL import Image
+
+    has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+    ext = ".png" if has_alpha else ".jpg"
+    out = DERIVED_DIR / f"{src.stem}-{sha[:12]}-{WEB_MAX_PX}{ext}"
+    if not out.exists():
+        DERIVED_DIR.mkdir(parents=True, exist_ok=True)
+        img = img.copy()
+        img.thumbnail((WEB_MAX_PX, WEB_MAX_PX))
+        tmp = out.with_name(out.name + ".tmp")
+        if ext == ".png":
+            img.save(tmp, format="PNG", optimize=True)
+        else:
+            img.convert("RGB").save(tmp, format="JPEG", quality=WEB_JPEG_QUALITY, optimize=True, progressive=True)
+        os.replace(tmp, out)
+    with Image.open(out) as web:
+        return _rel(out), web.width, web.height
+
+
+def build_manifest() -> dict:
+    files = {}
+    rooms = {}
+    for room in ROOMS_DATA:
+        names = []
+        for p in room.get("paths", []):
+            if not p:
+                continue
+            path = Path(p)
+            if path.name not in files:
+                files[path.name] = _describe(path)
+            names.append(path.name)
+        rooms[room["key"]] = names
+    for name in EXTRA_ASSETS:
+        if name not in files:
+            files[name] = _describe(ASSETS / name)
+    return {
+        "version": MANIFEST_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "signature": assets_signature(),
+        "files": files,
+        "rooms": rooms,
+    }
+
+
+def save_manifest(manifest: dict):
+    tmp = MANIFEST_PATH.with_name(MANIFEST_PATH.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, MANIFEST_PATH)
+
+
+def _read_saved_manifest():
+    try:
+        data = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if data.get("version") != MANIFEST_VERSION or data.get("signature") != assets_signature():
+        return None
+    rooms_now = {r["key"]: [Path(p).name for p in r.get("paths", []) if p] for r in ROOMS_DATA}
+    if data.get("rooms") != rooms_now:
+        return None
+    return data
+
+
+def load_manifest(rebuild: bool = False) -> dict:
+    """Reuse assets/manifest.json when it still matches assets/ and ROOMS_DATA, else rebuild it."""
+    data = None if rebuild else _read_saved_manifest()
+    if data is None:
+        data = build_manifest()
+        try:
+            save_manifest(data)
+        except OSError:
+            pass
+    return data
+
+
+def publish_static(manifest: dict):
+    """
+    Copy each web derivative into static/img/ and record its URL on the entry.
+    The `v` query argument makes Tornado's static handler send a far-future
+    Cache-Control header; the hashed file name keeps it safe to cache forever.
+    """
+    STATIC_IMG_DIR.mkdir(parents=True, exist_ok=True)
+    published = set()
+    for entry in manifest.get("files", {}).values():
+        rel = entry.get("derivatives", {}).get("web")
+        if not rel:
+            continue
+        src = BASE_DIR / rel
+        dest = STATIC_IMG_DIR / src.name
+        if not dest.exists():
+            try:
+                os.link(src, dest)
+            except OSError:
+                shutil.copy2(src, dest)
+        published.add(dest.name)
+        entry["url"] = f"{STATIC_URL_PREFIX}/{dest.name}?v={entry['sha256'][:12]}"
+    # Drop copies of images that have since changed or been removed
+    for old in STATIC_IMG_DIR.iterdir():
+        if old.is_file() and old.name not in published:
+            old.unlink()
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Validation
+# ──────────────────────────────────────────────────────────────────────────
+def validate_manifest(manifest: dict, verify_hashes: bool = False) -> list:
+    """Return a list of problems (empty when every referenced asset is usable)."""
+    problems = []
+    for key, names in manifest.get("rooms", {}).items():
+        if not names:
+            problems.append(f"room '{key}' has no photos")
+    for name, entry in manifest.get("files", {}).items():
+        if not entry.get("exists"):
+            problems.append(f"missing: {entry['path']}")
+            continue
+        if entry.get("error"):
+            problems.append(f"unreadable: {entry['path']} ({entry['error']})")
+        for kind, rel in entry.get("derivatives", {}).items():
+            if not (BASE_DIR / rel).is_file():
+                problems.append(f"missing {kind} derivative: {rel}")
+        if entry.get("url") and not (STATIC_IMG_DIR / Path(entry["url"].split("?")[0]).name).is_file():
+            problems.append(f"not published to static/: {entry['path']}")
+        if verify_hashes and _sha256(BASE_DIR / entry["path"]) != entry.get("sha256"):
+            problems.append(f"changed since manifest was built: {entry['path']}")
+    return problems
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Runtime access (no filesystem I/O once loaded)
+# ──────────────────────────────────────────────────────────────────────────
+def get_manifest() -> dict:
+    global _manifest, _stale
+    if _stale or _manifest is None:
+        with _lock:
+            if _stale or _manifest is None:
+                _stale = False
+                _manifest = load_manifest()
+                publish_static(_manifest)
+                for problem in validate_manifest(_manifest):
+                    print(f"[assets] {problem}", file=sys.stderr)
+    return _manifest
+
+
+def invalidate():
+    global _stale
+    _stale = True
+
+
+def display_path(entry: dict) -> str:
+    """Absolute path of the best file to show for a manifest entry."""
+    rel = entry.get("derivatives", {}).get("web") or entry["path"]
+    return str(BASE_DIR / rel)
+
+
+def asset_entry(name: str):
+    """Manifest entry for a file in assets/ (e.g. "logo.png"), or None."""
+    entry = get_manifest()["files"].get(name)
+    return entry if entry and entry.get("exists") and not entry.get("error") else None
+
+
+def room_images(room: dict) -> list:
+    """Manifest entries for a room's photos that exist and decoded cleanly."""
+    manifest = get_manifest()
+    files = manifest["files"]
+    entries = (files.get(name) for name in manifest["rooms"].get(room["key"], []))
+    return [e for e in entries if e and e.get("exists") and not e.get("error")]
+
+
+def watch_assets():
+    """Mark the manifest stale whenever a source file in assets/ changes (needs watchdog)."""
+    watch_paths([ASSETS], invalidate, ignore=lambda path: path.name.startswith(MANIFEST_PATH.name))
+
+
+if __name__ == "__main__":
+    manifest = load_manifest(rebuild="--build" in sys.argv)
+    publish_static(manifest)
+    print(json.dumps(manifest, indent=2) if "--print" in sys.argv else f"Manifest: {MANIFEST_PATH}")
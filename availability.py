@@ -0,0 +1,203 @@
+"""
+Room availability for Hotel Quinto.
+
+Blocked nights live in a small SQLite file (one row per booking/closure,
+half-open [start, end) like check-in/check-out). They are loaded into a
+per-room index of merged, sorted intervals so "is room X free from ci to co"
+is two binary searches. Staff can bulk-load a CSV export:
+    python availability.py import blocked.csv [--replace]
+    python availability.py check 2025-09-21 2025-09-23 2
+CSV columns: room (key, keyword or "all"), start, end, note (optional).
+An end equal to start blocks that single night.
+"""
+import csv
+import re
+import sqlite3
+import sys
+import threading
+from bisect import bisect_right
+from datetime import date, timedelta
+from pathlib import Path
+
+from rooms import BASE_DIR, ROOMS_DATA
+
+DEFAULT_DB_PATH = BASE_DIR / "data" / "availability.sqlite3"
+
+_ROOM_KEYS = {r["key"] for r in ROOMS_DATA}
+
+
+def _to_date(value) -> date:
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value).strip()[:10])
+
+
+def resolve_room(value: str):
+    """Room keys for a CSV room cell: a key, a room keyword, or "all"/"*"."""
+    v = (value or "").strip().lower()
+    if v in ("all", "*", "todas", "todos"):
+        return sorted(_ROOM_KEYS)
+    if v in _ROOM_KEYS:
+        return [v]
+    words = re.split(r"[\s_\-]+", v)
+    return [r["key"] for r in ROOMS_DATA if any(k in words for k in r["keywords"])][:1]
+
+
+class RoomIndex:
+    """Merged, sorted blocked intervals for one room (ordinal days, end exclusive)."""
+
+    def __init__(self, intervals):
+        starts, ends = [], []
+        for s, e in sorted(intervals):
+            if starts and s <= ends[-1]:
+                ends[-1] = max(ends[-1], e)
+            else:
+                starts.append(s)
+                ends.append(e)
+        self.starts = starts
+        self.ends = ends
+
+    def is_free(self, ci: int, co: int) -> bool:
+        # First block ending after ci is the only one that can overlap [ci, co)
+        i = bisect_right(self.ends, ci)
+        return i == len(self.starts) or self.starts[i] >= co
+
+
+class AvailabilityStore:
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._index = None
+        self._version = None
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        db = self._db()
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS blocks ("
+            " id INTEGER PRIMARY KEY, room TEXT NOT NULL, start TEXT NOT NULL, end TEXT NOT NULL,"
+            " note TEXT NOT NULL DEFAULT '', source TEXT NOT NULL DEFAULT '')"
+        )
+        db.execute("CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v INTEGER NOT NULL)")
+        db.execute("INSERT OR IGNORE INTO meta (k, v) VALUES ('version', 0)")
+
+    def _db(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._local.db = db
+        return db
+
+    # ── writes ────────────────────────────────────────────────────────────
+    def add_blocks(self, rows, source: str = "", replace: bool = False) -> int:
+        """Insert (room_key, start, end, note) rows in one transaction; returns rows written."""
+        clean = []
+        for room, start, end, note in rows:
+            s, e = _to_date(start), _to_date(end)
+            if e <= s:
+                e = s + timedelta(days=1)
+            clean.append((room, s.isoformat(), e.isoformat(), note or "", source))
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            if replace:
+                db.execute("DELETE FROM blocks")
+            db.executemany("INSERT INTO blocks (room, start, end, note, source) VALUES (?, ?, ?, ?, ?)", clean)
+            db.execute("UPDATE meta SET v = v + 1 WHERE k = 'version'")
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return len(clean)
+
+    def import_csv(self, path, replace: bool = False):
+        """Bulk-load blocked dates from a CSV export. Returns (rows written, skipped line numbers)."""
+        rows, skipped = [], []
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            for n, rec in enumerate(csv.DictReader(f), start=2):
+                # Trailing commas put the extra fields under key None as a list; ignore them
+                rec = {k.strip().lower(): (v or "").strip() for k, v in rec.items() if isinstance(k, str)}
+                room = rec.get("room") or rec.get("room_key") or rec.get("habitacion") or ""
+                start = rec.get("start") or rec.get("check_in") or rec.get("from") or ""
+                end = rec.get("end") or rec.get("check_out") or rec.get("to") or start
+                keys = resolve_room(room)
+                try:
+                    _to_date(start), _to_date(end)
+                except ValueError:
+                    keys = []
+                if not keys:
+                    skipped.append(n)
+                    continue
+                rows.extend((k, start, end, rec.get("note", "")) for k in keys)
+        return self.add_blocks(rows, source=Path(path).name, replace=replace), skipped
+
+    # ── reads ─────────────────────────────────────────────────────────────
+    def version(self) -> int:
+        """Bumped on every write; 0 means no blocks were ever loaded (no data to answer from)."""
+        (version,) = self._db().execute("SELECT v FROM meta WHERE k = 'version'").fetchone()
+        return version
+
+    def _current_index(self):
+        version = self.version()
+        if self._index is None or version != self._version:
+            with self._lock:
+                if self._index is None or version != self._version:
+                    per_room = {k: [] for k in _ROOM_KEYS}
+                    for room, s, e in self._db().execute("SELECT room, start, end FROM blocks"):
+                        per_room.setdefault(room, []).append(
+                            (date.fromisoformat(s).toordinal(), date.fromisoformat(e).toordinal())
+                        )
+                    self._index = {k: RoomIndex(v) for k, v in per_room.items()}
+                    self._version = version
+        return self._index
+
+    def is_free(self, room_key: str, ci, co) -> bool:
+        index = self._current_index().get(room_key)
+        return index is None or index.is_free(_to_date(ci).toordinal(), _to_date(co).toordinal())
+
+    def available_rooms(self, ci, co, guests: int = 1, rooms=None):
+        """Rooms (from `rooms`, default ROOMS_DATA) with capacity >= guests and no block in [ci, co)."""
+        index = self._current_index()
+        a, b = _to_date(ci).toordinal(), _to_date(co).toordinal()
+        if b <= a:
+            return []
+        out = []
+        for r in rooms if rooms is not None else ROOMS_DATA:
+            if r.get("capacity", 1) < guests:
+                continue
+            idx = index.get(r["key"])
+            if idx is None or idx.is_free(a, b):
+                out.append(r)
+        return out
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path=None) -> AvailabilityStore:
+    """Process-wide store for `path` (memoized across Streamlit reruns)."""
+    path = str(path or DEFAULT_DB_PATH)
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = AvailabilityStore(path)
+        return _stores[path]
+
+
+if __name__ == "__main__":
+    import settings
+
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    # Same file the app opens (AVAILABILITY_DB, relative to the app directory)
+    store = get_store(BASE_DIR / settings.current().AVAILABILITY_DB)
+    if len(args) >= 2 and args[0] == "import":
+        written, skipped = store.import_csv(args[1], replace="--replace" in sys.argv)
+        print(f"Imported {written} blocked range(s) into {store.path}")
+        if skipped:
+            print("Skipped CSV lines (unknown room or bad date):", ", ".join(map(str, skipped)))
+    elif len(args) >= 3 and args[0] == "check":
+        guests = int(args[3]) if len(args) > 3 else 1
+        free = store.available_rooms(args[1], args[2], guests)
+        print("Free:", ", ".join(r["key"] for r in free) or "(none)")
+    else:
+        print(__doc__)
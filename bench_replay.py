@@ -0,0 +1,233 @@
+"""
+Replay benchmark: runs every guest question in faq_log.csv through the chat
+answer path (chat_pipeline.answer_chat) with a recorded LLM, writes a JSON
+report and compares it against a stored baseline.
+
+Run:
+    python bench_replay.py                     # compare with bench/baseline.json
+    python bench_replay.py --update-baseline   # accept current numbers
+Exit code is 1 when a metric regresses past its tolerance (for CI).
+"""
+import argparse
+import csv
+import json
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import chat_pipeline
+from chat_pipeline import answer_chat, clear_answer_cache, estimate_tokens, normalize_question
+
+BASE_DIR = Path(__file__).parent
+DEFAULT_LOG = BASE_DIR / "faq_log.csv"
+DEFAULT_OUT = BASE_DIR / "bench" / "results.json"
+DEFAULT_BASELINE = BASE_DIR / "bench" / "baseline.json"
+
+LANG_CODES = {"en": "English", "es": "Español"}
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Recorded LLM (same call shape as OpenAI().chat.completions.create)
+# ──────────────────────────────────────────────────────────────────────────
+class RecordedClient:
+    """Replies with the answer logged for the question; counts upstream calls."""
+
+    def __init__(self, recordings, delay_ms: float = 0.0):
+        self.recordings = recordings
+        self.delay_ms = delay_ms
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, stream=False, **kwargs):
+        with self._lock:
+            self.calls += 1
+        if self.delay_ms:
+            time.sleep(self.delay_ms / 1000)
+        question = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+        answer = self.recordings.get(normalize_question(question), "")
+        usage = SimpleNamespace(
+            prompt_tokens=sum(estimate_tokens(m.get("content", "")) + 4 for m in messages) + 2,
+            completion_tokens=estimate_tokens(answer),
+        )
+        if stream:
+            # Content chunk, then a choice-less chunk carrying usage (stream_options include_usage)
+            delta = SimpleNamespace(content=answer)
+            return iter([
+                SimpleNamespace(model=model, choices=[SimpleNamespace(delta=delta)], usage=None),
+                SimpleNamespace(model=model, choices=[], usage=usage),
+            ])
+        message = SimpleNamespace(content=answer)
+        return SimpleNamespace(model=model, choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+def load_log(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = [r for r in csv.DictReader(f) if (r.get("question") or "").strip()]
+    recordings = {}
+    for r in rows:
+        recordings.setdefault(normalize_question(r["question"]), r.get("answer", ""))
+    return rows, recordings
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Replay & report
+# ──────────────────────────────────────────────────────────────────────────
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _replay_one(r, client):
+    lang = LANG_CODES.get((r.get("lang") or "en").strip().lower(), "English")
+    result = answer_chat([{"role": "user", "content": r["question"]}], lang, client)
+    return {
+        "lang": lang,
+        "question": r["question"],
+        "route": result["route"],
+        "cache_hit": result["cache_hit"],
+        "coalesced": result["coalesced"],
+        "tier": result["tier"],
+        "rooms": result["rooms"],
+        "prompt_tokens": result["prompt_tokens"],
+        "completion_tokens": result["completion_tokens"],
+        "latency_ms": round(result["latency_ms"], 4),
+    }
+
+
+def run_replay(rows, recordings, repeat: int = 1, delay_ms: float = 0.0, burst: int = 1):
+    """
+    Replay every row `repeat` times. With burst > 1 each question is sent by
+    `burst` concurrent sessions at once (a tour group asking the same thing).
+    """
+    clear_answer_cache()
+    client = RecordedClient(recordings, delay_ms=delay_ms)
+    per_question = []
+    with ThreadPoolExecutor(max_workers=max(1, burst)) as pool:
+        for _ in range(repeat):
+            for r in rows:
+                if burst > 1:
+                    per_question.extend(pool.map(lambda _: _replay_one(r, client), range(burst)))
+                else:
+                    per_question.append(_replay_one(r, client))
+
+    n = len(per_question) or 1
+    latencies = [q["latency_ms"] for q in per_question]
+    routes = {}
+    tiers = {}
+    for q in per_question:
+        routes[q["route"]] = routes.get(q["route"], 0) + 1
+        if q["tier"]:
+            tiers[q["tier"]] = tiers.get(q["tier"], 0) + 1
+    summary = {
+        "questions": len(per_question),
+        "upstream_calls": client.calls,
+        "latency_ms_mean": round(statistics.fmean(latencies), 4) if latencies else 0.0,
+        "latency_ms_p50": round(_percentile(latencies, 50), 4),
+        "latency_ms_p95": round(_percentile(latencies, 95), 4),
+        "cache_hit_rate": round(sum(q["cache_hit"] for q in per_question) / n, 4),
+        "coalesced_rate": round(sum(q["coalesced"] for q in per_question) / n, 4),
+        "route_counts": routes,
+        "route_rates": {k: round(v / n, 4) for k, v in routes.items()},
+        "llm_rate": round(routes.get("llm", 0) / n, 4),
+        "tier_counts": tiers,
+        "room_match_rate": round(sum(bool(q["rooms"]) for q in per_question) / n, 4),
+        "system_prompt_tokens": estimate_tokens(chat_pipeline.SYSTEM_PROMPT),
+        "prompt_tokens_total": sum(q["prompt_tokens"] for q in per_question),
+        "prompt_tokens_mean": round(sum(q["prompt_tokens"] for q in per_question) / n, 2),
+        # Per question that reached the LLM: what SYSTEM_PROMPT/grounding edits move
+        "prompt_tokens_per_llm_call": round(
+            sum(q["prompt_tokens"] for q in per_question if q["route"] == "llm") / max(1, routes.get("llm", 0)), 2
+        ),
+        "completion_tokens_total": sum(q["completion_tokens"] for q in per_question),
+    }
+    return {"summary": summary, "questions": per_question}
+
+
+# Metric -> (direction, relative tolerance, absolute slack). "lower" means lower is better.
+CHECKS = {
+    "latency_ms_p50": ("lower", 0.5, 1.0),
+    "latency_ms_p95": ("lower", 0.5, 2.0),
+    "llm_rate": ("lower", 0.0, 0.0001),
+    "upstream_calls": ("lower", 0.0, 0),
+    "prompt_tokens_mean": ("lower", 0.05, 0),
+    "prompt_tokens_per_llm_call": ("lower", 0.05, 0),
+    "cache_hit_rate": ("higher", 0.0, 0.0001),
+    "room_match_rate": ("higher", 0.0, 0.0001),
+}
+
+
+def compare(summary, baseline, latency_tolerance=None):
+    """Return a list of human-readable regressions (empty when all good)."""
+    regressions = []
+    for metric, (direction, rel, slack) in CHECKS.items():
+        if metric not in baseline or metric not in summary:
+            continue
+        if latency_tolerance is not None and metric.startswith("latency"):
+            rel = latency_tolerance
+        old, new = baseline[metric], summary[metric]
+        allowed = abs(old) * rel + slack
+        worse = (new - old) if direction == "lower" else (old - new)
+        if worse > allowed:
+            regressions.append(f"{metric}: {old} -> {new} (allowed drift {allowed:g})")
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--log", default=str(DEFAULT_LOG), help="CSV with lang,question,answer columns")
+    ap.add_argument("--out", default=str(DEFAULT_OUT), help="where to write the JSON report")
+    ap.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    ap.add_argument("--update-baseline", action="store_true", help="overwrite the baseline with this run")
+    ap.add_argument("--repeat", type=int, default=1, help="replay the log N times (warm cache after the first)")
+    ap.add_argument("--burst", type=int, default=1, help="concurrent sessions sending each question")
+    ap.add_argument("--llm-delay-ms", type=float, default=0.0, help="simulated upstream latency per LLM call")
+    ap.add_argument("--latency-tolerance", type=float, default=None, help="override relative latency tolerance")
+    args = ap.parse_args(argv)
+
+    rows, recordings = load_log(args.log)
+    report = run_replay(
+        rows, recordings, repeat=max(1, args.repeat), delay_ms=args.llm_delay_ms, burst=max(1, args.burst)
+    )
+    summary = report["summary"]
+    report["params"] = {
+        "log": Path(args.log).name,
+        "repeat": args.repeat,
+        "burst": args.burst,
+        "llm_delay_ms": args.llm_delay_ms,
+    }
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(summary, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"\nBaseline updated: {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"\nNo baseline at {baseline_path}; run with --update-baseline to create one.")
+        return 0
+
+    regressions = compare(summary, json.loads(baseline_path.read_text(encoding="utf-8")), args.latency_tolerance)
+    if regressions:
+        print("\n❌ Regressions vs baseline:")
+        for line in regressions:
+            print("-", line)
+        return 1
+    print("\n✅ No regressions vs baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""
+Chat answer path for Hotel Quinto: place routing, answer cache, prompt
+building, LLM call and room matching. No Streamlit imports, so bench_replay.py can drive it
+offline with a recorded LLM.
+"""
+import hashlib
+import os
+import threading
+import time
+
+from places import HOTEL_MAPS_URL, answer_place_question, place_context
+from rooms import match_rooms_from_text
+from text_utils import normalize_question
+from shared_cache import MemoryCache
+from single_flight import SingleFlight
+from model_policy import policy as model_policy
+from llm_metrics import metrics
+
+SYSTEM_PROMPT = (
+    "You are the Hotel Quinto assistant. Be concise, friendly, bilingual when needed, "
+    "and respect policies: payments are cash (COP) or bank transfer only. "
+    "If asked for the address or location, reply with: 'Hotel Quinto is located at Vereda La Frontera, Circasia, Quindío, Colombia. "
+    # Same pin (from HOTEL_LAT/HOTEL_LON) as the place_context grounding note
+    f"You can find us on Google Maps here: {HOTEL_MAPS_URL} "
+    "Always provide helpful tips and a welcoming tone."
+)
+
+# Model and max_tokens are picked per request by model_policy
+CHAT_TEMPERATURE = 0.4
+
+FALLBACK_REPLY = "Thanks! Share dates via WhatsApp or click a room to ask about availability."
+
+# ──────────────────────────────────────────────────────────────────────────
+# Helpers
+# ──────────────────────────────────────────────────────────────────────────
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), used when the API gives no usage."""
+    return (len(text) + 3) // 4 if text else 0
+
+
+def count_prompt_tokens(convo) -> int:
+    # ~4 tokens of framing per chat message plus 2 for the reply primer
+    return sum(estimate_tokens(m.get("content", "")) + 4 for m in convo) + 2
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Answer cache (context-free first turns only)
+# ──────────────────────────────────────────────────────────────────────────
+ANSWER_CACHE_SIZE = 256
+_answer_cache = MemoryCache(max_entries=ANSWER_CACHE_SIZE)
+_answer_cache_ttl = None
+_answer_cache_context = ""
+
+
+def set_answer_cache(cache, ttl=None, context: str = ""):
+    """
+    Swap in another cache backend (see shared_cache.get_cache). `context` is
+    mixed into every key; pass a fingerprint of the settings answers depend
+    on so changing them stops serving the old entries.
+    """
+    global _answer_cache, _answer_cache_ttl, _answer_cache_context
+    _answer_cache = cache
+    _answer_cache_ttl = ttl
+    _answer_cache_context = context
+
+
+def answer_cache_key(messages, lang: str):
+    """Cache key for a single user question with no prior context, else None."""
+    if len(messages) != 1 or messages[0].get("role") != "user":
+        return None
+    q = normalize_question(messages[0].get("content", ""))
+    if not q:
+        return None
+    # Prompt/context fingerprint so a SYSTEM_PROMPT or settings edit never serves stale answers
+    version = hashlib.sha1((SYSTEM_PROMPT + _answer_cache_context).encode("utf-8")).hexdigest()[:10]
+    return f"{version}|{lang}|{q}"
+
+
+def clear_answer_cache():
+    _answer_cache.clear()
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# OpenAI client (one per process so its HTTPS connections are reused)
+# ──────────────────────────────────────────────────────────────────────────
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_openai_client():
+    """Shared OpenAI client for the current OPENAI_API_KEY, or None without a key."""
+    api_key = os.getenv("OPENAI_API_KEY", "").strip()
+    if not api_key:
+        return None
+    with _clients_lock:
+        if api_key not in _clients:
+            from openai import OpenAI
+
+            _clients[api_key] = OpenAI(api_key=api_key)
+        return _clients[api_key]
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# LLM call (coalesced across sessions for cacheable questions)
+# ──────────────────────────────────────────────────────────────────────────
+IN_FLIGHT_TIMEOUT_SECONDS = 60
+_in_flight = SingleFlight()
+
+
+def _fetch_answer(client, convo, key, tier, lang):
+    # Re-check the cache: a call for this key may have finished since our lookup
+    if key:
+        cached = _answer_cache.get(key)
+        if cached is not None:
+            return {"answer": cached, "cached": True}
+    start = time.perf_counter()
+    ttfb_ms = None
+    parts, usage = [], None
+    try:
+        # Streamed so time-to-first-byte can be measured; usage arrives in the last chunk
+        stream = client.chat.completions.create(
+            model=tier["model"],
+            messages=convo,
+            temperature=CHAT_TEMPERATURE,
+            max_tokens=tier["max_tokens"],
+            stream=True,
+            stream_options={"include_usage": True},
+            # Joiners give up after this long, so the leader must not hold the key longer
+            timeout=IN_FLIGHT_TIMEOUT_SECONDS,
+        )
+        for chunk in stream:
+            if time.perf_counter() - start > IN_FLIGHT_TIMEOUT_SECONDS:
+                raise TimeoutError(f"LLM answer took longer than {IN_FLIGHT_TIMEOUT_SECONDS}s")
+            if ttfb_ms is None:
+                ttfb_ms = (time.perf_counter() - start) * 1000
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+            if getattr(chunk, "usage", None) is not None:
+                usage = chunk.usage
+    except Exception:
+        latency_ms = (time.perf_counter() - start) * 1000
+        model_policy.record(tier["model"], ttfb_ms if ttfb_ms is not None else latency_ms, ok=False)
+        metrics.record_call(tier["model"], lang, latency_ms, ttfb_ms, ok=False)
+        raise
+    latency_ms = (time.perf_counter() - start) * 1000
+    # Health is judged on TTFB: total latency grows with answer length, not with model trouble
+    model_policy.record(tier["model"], ttfb_ms if ttfb_ms is not None else latency_ms, ok=True)
+    answer = "".join(parts)
+    out = {"answer": answer, "cached": False, "ttfb_ms": ttfb_ms}
+    if usage is not None:
+        out["prompt_tokens"] = usage.prompt_tokens
+        out["completion_tokens"] = usage.completion_tokens
+    else:
+        out["prompt_tokens"] = count_prompt_tokens(convo)
+        out["completion_tokens"] = estimate_tokens(answer)
+    metrics.record_call(
+        tier["model"], lang, latency_ms, ttfb_ms, out["prompt_tokens"], out["completion_tokens"], ok=True
+    )
+    # Store before the in-flight entry is released so late arrivals hit the cache
+    if key and answer:
+        _answer_cache.set(key, answer, ttl=_answer_cache_ttl)
+    return out
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Answer path
+# ──────────────────────────────────────────────────────────────────────────
+
+def answer_chat(messages, lang: str, client=None):
+    """
+    Answer the last user message in `messages`.
+    `client` is an OpenAI client (or anything with the same
+    chat.completions.create shape); None means no API key, so we reply with
+    the WhatsApp fallback.
+    Returns a dict with the answer text, the route taken ("places", "cache",
+    "llm" or "fallback"), whether it joined another session's in-flight call,
+    the model/tier used, upstream token counts, time to first byte, matched
+    room keys and latency in ms. Every call is counted in llm_metrics.
+    """
+    start = time.perf_counter()
+    question = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+    result = {
+        "answer": "",
+        "route": "fallback",
+        "cache_hit": False,
+        "coalesced": False,
+        "model": None,
+        "tier": None,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "ttfb_ms": None,
+        "rooms": [],
+        "latency_ms": 0.0,
+    }
+
+    key = answer_cache_key(messages, lang)
+    direct = answer_place_question(question, lang)
+    cached = _answer_cache.get(key) if key and direct is None else None
+    if direct is not None:
+        result.update(answer=direct, route="places")
+    elif cached is not None:
+        result.update(answer=cached, route="cache", cache_hit=True)
+    elif client is None:
+        result["answer"] = FALLBACK_REPLY
+    else:
+        convo = [{"role": "system", "content": SYSTEM_PROMPT}]
+        grounding = place_context(question)
+        if grounding:
+            convo.append({"role": "system", "content": grounding})
+        convo += list(messages)
+        tier = model_policy.choose(messages)
+        try:
+            if key:
+                # Identical context-free questions in flight from other sessions share one call
+                out, shared = _in_flight.do(
+                    key, lambda: _fetch_answer(client, convo, key, tier, lang), timeout=IN_FLIGHT_TIMEOUT_SECONDS
+                )
+            else:
+                out, shared = _fetch_answer(client, convo, None, tier, lang), False
+        except Exception:
+            metrics.record_request("error", lang, (time.perf_counter() - start) * 1000)
+            raise
+        if out["cached"]:
+            result.update(answer=out["answer"], route="cache", cache_hit=True)
+        elif shared:
+            result.update(answer=out["answer"], route="llm", coalesced=True)
+        else:
+            result.update(
+                answer=out["answer"],
+                route="llm",
+                model=tier["model"],
+                tier=tier["name"],
+                prompt_tokens=out["prompt_tokens"],
+                completion_tokens=out["completion_tokens"],
+                ttfb_ms=out["ttfb_ms"],
+            )
+
+    result["rooms"] = [r["key"] for r in match_rooms_from_text(result["answer"])]
+    result["latency_ms"] = (time.perf_counter() - start) * 1000
+    metrics.record_request("coalesced" if result["coalesced"] else result["route"], lang, result["latency_ms"])
+    return result
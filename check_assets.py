@@ -1,29 +1,22 @@
-import os
+import sys
 
-# Folder where your images are stored
-assets_dir = "assets"
+from asset_manifest import MANIFEST_PATH, load_manifest, validate_manifest
 
-# List the files your app EXPECTS (copy these from your error message)
-expected_files = [
-    "stairs-bedroom-downstairs.jpg",
-    "upstairs-bedroom.jpg",
-    "three-bed-room.jpg",
-    "four-bed.jpg"
-]
-
-# Get the actual files inside /assets
-actual_files = os.listdir(assets_dir)
+# Expected files come from ROOMS_DATA via the asset manifest (no hardcoded list).
+# Pass --build to force a rebuild of assets/manifest.json and its derivatives.
+manifest = load_manifest(rebuild="--build" in sys.argv)
 
 print("\n--- Checking Assets ---")
-print("Expected:", expected_files)
-print("Found in folder:", actual_files)
+print("Manifest:", MANIFEST_PATH)
+for key, names in manifest["rooms"].items():
+    print(f"{key}: {', '.join(names) or '(none)'}")
 
-# Check which ones are missing
-missing = [f for f in expected_files if f not in actual_files]
+problems = validate_manifest(manifest, verify_hashes=True)
 
-if missing:
-    print("\n❌ Missing files:")
-    for f in missing:
-        print("-", f)
+if problems:
+    print("\n❌ Problems:")
+    for p in problems:
+        print("-", p)
+    sys.exit(1)
 else:
     print("\n✅ All expected files are present!")
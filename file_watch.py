@@ -0,0 +1,53 @@
+"""
+Watchdog helper for the hot-reload hooks (settings, asset manifest): call a
+callback whenever one of a few files, or any file in a folder, changes. One
+observer per set of paths per process, so Streamlit reruns can call
+watch_paths() again safely.
+"""
+import os
+import threading
+from pathlib import Path
+
+_observers = {}
+_lock = threading.Lock()
+
+
+def watch_paths(paths, callback, ignore=None) -> bool:
+    """
+    Call callback() when a watched file, or any file inside a watched folder,
+    is created, deleted, modified or moved. `ignore(path)` can skip events.
+    Returns False when watchdog is not installed.
+    """
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return False
+
+    paths = frozenset(Path(p).resolve() for p in paths if p)
+    folders = {p for p in paths if p.is_dir()}
+    files = paths - folders
+
+    class _Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.event_type not in ("created", "deleted", "modified", "moved") or event.is_directory:
+                return
+            # Editors often save via a temp file + rename, so check both ends
+            for raw in (event.src_path, getattr(event, "dest_path", "")):
+                if not raw:
+                    continue
+                path = Path(os.fsdecode(raw)).resolve()
+                if (path in files or path.parent in folders) and not (ignore and ignore(path)):
+                    callback()
+                    return
+
+    with _lock:
+        if paths in _observers:
+            return True
+        observer = Observer()
+        observer.daemon = True
+        for folder in folders | {p.parent for p in files if p.parent.is_dir()}:
+            observer.schedule(_Handler(), str(folder), recursive=False)
+        observer.start()
+        _observers[paths] = observer
+    return True
@@ -0,0 +1,73 @@
+"""
+USD->COP rates for the app, cached in the shared "fx" cache so every
+session (and, with CACHE_BACKEND=sqlite, every process) reuses one fetch.
+Moved out of app.py so warmup.py can prefetch the same entries.
+"""
+import requests
+
+import settings
+from shared_cache import get_cache
+
+
+def fx_cache():
+    S = settings.current()
+    return get_cache("fx", S.CACHE_BACKEND, S.CACHE_PATH, max_entries=16)
+
+def fx_key(source: str) -> str:
+    # Entries cached under an older FX_CACHE_TTL_SECONDS are not reused after it changes
+    return f"{source}:USD:COP:{settings.current().fingerprint('FX_CACHE_TTL_SECONDS')}"
+
+def _live_open_er_api():
+    r = requests.get("https://open.er-api.com/v6/latest/USD", timeout=6)
+    r.raise_for_status()
+    data = r.json()
+    return [float(data["rates"]["COP"]), data.get("time_last_update_utc", "today")]
+
+def fetch_usd_to_cop():
+    """Fetch today's USD->COP rate. Returns (rate_float, as_of_text). Fallback if offline."""
+    try:
+        # Shared across sessions/processes; failures are not cached
+        rate, as_of = fx_cache().get_or_compute(fx_key("open.er-api"), _live_open_er_api, ttl=settings.current().FX_CACHE_TTL_SECONDS)
+        return rate, as_of
+    except Exception:
+        pass
+    return 3894.0, "approx (fallback)"
+
+def _live_exchangerate_host():
+    url = "https://api.exchangerate.host/latest?base=USD&symbols=COP"
+    response = requests.get(url, timeout=5)
+    response.raise_for_status()
+    data = response.json()
+    return data["rates"]["COP"]
+
+def exchangerate_host_rate(default_rate: float = 4000.0, refresh: bool = False):
+    """USD->COP from exchangerate.host via the FX cache; default_rate if the API fails."""
+    key = fx_key("exchangerate.host")
+    if refresh:
+        fx_cache().delete(key)
+    try:
+        return fx_cache().get_or_compute(key, _live_exchangerate_host, ttl=settings.current().FX_CACHE_TTL_SECONDS)
+    except Exception:
+        return default_rate
+
+# New: USD to COP conversion using exchangerate.host
+def usd_to_cop(amount_usd: float, default_rate: float = 4000.0, refresh: bool = False):
+    """
+    Convert USD to COP using the latest exchange rate from exchangerate.host.
+    Returns (converted_amount, rate_used).
+    If the API fails, uses default_rate.
+    """
+    rate = exchangerate_host_rate(default_rate, refresh)
+    converted = amount_usd * rate
+    return converted, rate
+
+# New: COP to USD conversion using the same rate
+def cop_to_usd(amount_cop: float, default_rate: float = 4000.0):
+    """
+    Convert COP to USD using the latest exchange rate from exchangerate.host.
+    Returns (converted_amount, rate_used).
+    If the API fails, uses default_rate.
+    """
+    rate = exchangerate_host_rate(default_rate)
+    converted = amount_cop / rate
+    return converted, rate
@@ -1,9 +1,24 @@
 # app.py
 import streamlit as st
+import io
+import re
+import time
+import zipfile
 from datetime import datetime
 from urllib.parse import quote as urlquote
 
+import numpy as np
+import pandas as pd
+
 # ---- Try to import your project settings (optional). Fallbacks keep things working. ----
+try:
+    # Re-read .env if it changed since the last rerun so the imports below see new values
+    import settings
+    settings.watch()
+    settings.current()
+except Exception:
+    pass
+
 try:
     from settings import USD_RATE as SETTINGS_USD_RATE  # default nightly USD per person
 except Exception:
@@ -15,6 +30,12 @@ try:
 except Exception:
     SETTINGS_WHATSAPP = "+573202190476"
 
+try:
+    # Promo codes, e.g. {"WEEKLY10": "10% off stays of 7+ nights"}
+    from settings import PROMOS as SETTINGS_PROMOS
+except Exception:
+    SETTINGS_PROMOS = {}
+
 # If you have a live FX somewhere in your codebase, import it here.
 # Otherwise we will gracefully fall back to 3900.0
 def get_fx_rate_defaulted(candidate: float | None) -> float:
@@ -124,6 +145,195 @@ def render_booking_card(
     }
 
 
+# ---------- Quote text / WhatsApp link (shared by single and batch quotes) ----------
+def fmt_cop(n: int) -> str:
+    return f"{n:,.0f}".replace(",", ".")
+
+def fmt_usd(n: float) -> str:
+    return f"{n:,.2f}"
+
+def build_quote_text(guests, nights, usd_per_person, total_usd, total_cop, fx_rate, asof_str, promo=None):
+    return (
+        "Booking Quote — Hotel Quinto\n"
+        f"Guests: {guests}, Nights: {nights}\n"
+        f"Base Rate: USD {fmt_usd(usd_per_person)} per person per night\n"
+        + (f"Promo: {promo}\n" if promo else "")
+        + f"Estimated Total: USD {fmt_usd(total_usd)} (≈ {fmt_cop(total_cop)} COP)\n"
+        f"Rate: 1 USD ≈ {fmt_cop(int(round(fx_rate)))} COP (as of {asof_str})\n"
+    )
+
+def build_wa_url(guests, nights, total_usd, total_cop, fx_rate, asof_str):
+    wa_msg = (
+        f"Hello Hotel Quinto 👋, I’d like to book {guests} guest"
+        f"{'s' if guests!=1 else ''} for {nights} night"
+        f"{'s' if nights!=1 else ''}. "
+        f"Estimated total: USD {fmt_usd(total_usd)} "
+        f"(≈ {fmt_cop(total_cop)} COP). "
+        f"Rate: 1 USD ≈ {fmt_cop(int(round(fx_rate)))} COP ({asof_str})."
+    )
+    return f"https://wa.me/{SETTINGS_WHATSAPP.replace('+','')}" \
+           f"?text={urlquote(wa_msg)}"
+
+
+# ---------- Batch quotes (CSV upload) ----------
+BATCH_TEMPLATE_CSV = "name,guests,nights,rate,promo\nAna Group,6,3,,WEEKLY10\nSmith family,4,7,24,\n"
+
+def promo_rules(promos: dict) -> dict:
+    """
+    Read discounts out of promo descriptions:
+    "10% off stays of 7+ nights" -> 10% when nights >= 7, "Stay 3 nights, pay 2" -> every 3rd night free.
+    Returns {CODE: (pct, min_nights, stay_n, pay_n)}.
+    """
+    rules = {}
+    for code, desc in (promos or {}).items():
+        desc = str(desc).lower()
+        pct = re.search(r"(\d+(?:\.\d+)?)\s*%", desc)
+        min_n = re.search(r"(\d+)\s*\+\s*(?:nights|noches)", desc)
+        stay_pay = re.search(r"(?:stay|quedate)\s*(\d+).*?(?:pay|paga)\s*(\d+)", desc)
+        rules[code.strip().upper()] = (
+            float(pct.group(1)) if pct else 0.0,
+            int(min_n.group(1)) if min_n else 0,
+            int(stay_pay.group(1)) if stay_pay else 0,
+            int(stay_pay.group(2)) if stay_pay else 0,
+        )
+    return rules
+
+def compute_batch_quotes(df, fx_rate: float, default_usd: float, promos: dict):
+    """
+    All quotes in one vectorized pass at a single FX snapshot.
+    Expects columns guests, nights and optionally rate (USD/person/night) and promo.
+    Rows with missing/invalid guests or nights get valid=False; promo_status
+    says whether a row's code was applied, "not eligible", has "no pricing rule"
+    or is "unknown".
+    """
+    out = pd.DataFrame(index=df.index)
+    out["name"] = df["name"].fillna("").astype(str) if "name" in df else ""
+    guests = pd.to_numeric(df.get("guests"), errors="coerce")
+    nights = pd.to_numeric(df.get("nights"), errors="coerce")
+    rate = pd.to_numeric(df["rate"], errors="coerce") if "rate" in df else pd.Series(np.nan, index=df.index)
+    rate = rate.where(rate > 0, float(default_usd))
+    promo = df["promo"].fillna("").astype(str).str.strip().str.upper() if "promo" in df else pd.Series("", index=df.index)
+
+    valid = guests.ge(1) & nights.ge(1)
+    g = guests.where(valid, 0).round().astype(int).to_numpy()
+    n = nights.where(valid, 0).round().astype(int).to_numpy()
+    usd = rate.to_numpy(dtype=float)
+
+    rules = promo_rules(promos)
+    known = promo.isin(list(rules)).to_numpy()
+    pct = promo.map({k: v[0] for k, v in rules.items()}).fillna(0.0).to_numpy(dtype=float)
+    min_n = promo.map({k: v[1] for k, v in rules.items()}).fillna(0).to_numpy(dtype=int)
+    stay_n = promo.map({k: v[2] for k, v in rules.items()}).fillna(0).to_numpy(dtype=int)
+    pay_n = promo.map({k: v[3] for k, v in rules.items()}).fillna(0).to_numpy(dtype=int)
+
+    # A description with no "%" and no "stay N ... pay M" (e.g. "Free breakfast") changes no price
+    priced = known & ((pct > 0) | (stay_n > pay_n))
+    eligible = priced & (n >= min_n)
+    pct = np.where(eligible, pct, 0.0)
+    free_nights = np.where(eligible & (stay_n > 0), (n // np.maximum(stay_n, 1)) * (stay_n - pay_n), 0)
+    charged = n - free_nights
+
+    total_usd = np.round(usd * g * charged * (1 - pct / 100), 2)
+    out["guests"] = g
+    out["nights"] = n
+    out["usd_per_person"] = usd
+    out["promo"] = np.where(eligible, promo.to_numpy(), "")
+    out["promo_status"] = np.select(
+        [promo.eq("").to_numpy(), eligible, priced, known],
+        ["", "applied", "not eligible", "no pricing rule"],
+        default="unknown",
+    )
+    out["discount_pct"] = pct
+    out["charged_nights"] = charged
+    out["total_usd"] = total_usd
+    out["total_cop"] = np.rint(total_usd * fx_rate).astype(np.int64)
+    out["fx_rate"] = float(fx_rate)
+    out["valid"] = valid.to_numpy()
+    return out
+
+def batch_quote_files(quotes, asof_str: str, progress=None, chunk: int = 500):
+    """Quote texts + wa.me links for every valid row; returns (csv_bytes, zip_bytes)."""
+    q = quotes[quotes["valid"]].copy()
+    texts, links = [], []
+    cols = zip(q["guests"], q["nights"], q["usd_per_person"], q["total_usd"], q["total_cop"],
+               q["fx_rate"], q["promo"], q["discount_pct"], q["charged_nights"])
+    for i, (g, n, usd, t_usd, t_cop, fx, promo, pct, charged) in enumerate(cols, start=1):
+        promo_txt = None
+        if promo:
+            promo_txt = f"{promo} (-{pct:g}%)" if pct else f"{promo} ({charged} of {n} nights charged)"
+        texts.append(build_quote_text(g, n, usd, t_usd, t_cop, fx, asof_str, promo=promo_txt))
+        links.append(build_wa_url(g, n, t_usd, t_cop, fx, asof_str))
+        if progress is not None and i % chunk == 0:
+            progress(i / len(q))
+    q["quote_text"] = texts
+    q["wa_url"] = links
+    q = q.drop(columns=["valid"])
+    csv_bytes = q.to_csv(index_label="row").encode("utf-8")
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("quotes.csv", csv_bytes)
+        for row, name, text in zip(q.index, q["name"], texts):
+            slug = re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_")[:40]
+            zf.writestr(f"quotes/{row:05d}{'_' + slug if slug else ''}.txt", text)
+    if progress is not None:
+        progress(1.0)
+    return csv_bytes, buf.getvalue()
+
+def batch_quotes_ui():
+    st.divider()
+    st.subheader("Batch quotes (CSV upload)")
+    st.caption("Columns: guests, nights, optional rate (USD/person/night), promo and name. One FX snapshot is used for every row.")
+    st.download_button("⬇️ CSV template", data=BATCH_TEMPLATE_CSV, file_name="batch_quotes_template.csv", mime="text/csv")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        fx_batch = st.number_input("FX snapshot: COP per USD (0 → 3,900)", min_value=0.0, max_value=20000.0, value=3960.0, step=10.0, key="fx_batch")
+    with col2:
+        asof_batch = st.text_input("Rate timestamp label", value=datetime.now().strftime("%Y-%m-%d %H:%M"), key="asof_batch")
+    uploaded = st.file_uploader("Guest enquiries (.csv)", type=["csv"])
+    if uploaded is None:
+        return
+
+    try:
+        df = pd.read_csv(uploaded)
+    except Exception as e:
+        st.error(f"Could not read CSV: {e}")
+        return
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    df = df.rename(columns={"usd_per_person": "rate", "promo_code": "promo"})
+    if not {"guests", "nights"} <= set(df.columns):
+        st.error("CSV needs at least 'guests' and 'nights' columns.")
+        return
+
+    fx_rate = get_fx_rate_defaulted(fx_batch)
+    t0 = time.perf_counter()
+    quotes = compute_batch_quotes(df, fx_rate, float(SETTINGS_USD_RATE), SETTINGS_PROMOS)
+    compute_ms = (time.perf_counter() - t0) * 1000
+
+    bar = st.progress(0.0, text="Building quotes…")
+    csv_bytes, zip_bytes = batch_quote_files(quotes, asof_batch, progress=lambda p: bar.progress(p, text="Building quotes…"))
+    bar.empty()
+
+    n_valid = int(quotes["valid"].sum())
+    st.success(f"{n_valid} quote(s) computed in {compute_ms:.1f} ms at 1 USD ≈ {fmt_cop(int(round(fx_rate)))} COP.")
+    if n_valid < len(quotes):
+        st.warning(f"Skipped {len(quotes) - n_valid} row(s) with missing or invalid guests/nights.")
+    n_unknown = int((quotes["valid"] & quotes["promo_status"].eq("unknown")).sum())
+    if n_unknown:
+        st.warning(f"{n_unknown} row(s) have an unknown promo code and were quoted without a discount (see promo_status).")
+    n_unpriced = int((quotes["valid"] & quotes["promo_status"].eq("no pricing rule")).sum())
+    if n_unpriced:
+        st.warning(f"{n_unpriced} row(s) use a promo with no % or stay/pay rule in its description; no discount was applied (see promo_status).")
+    st.dataframe(quotes[quotes["valid"]].drop(columns=["valid"]).head(50), use_container_width=True)
+
+    colA, colB = st.columns(2)
+    with colA:
+        st.download_button("⬇️ Quotes (.csv)", data=csv_bytes, file_name="Hotel_Quinto_Quotes.csv", mime="text/csv")
+    with colB:
+        st.download_button("⬇️ Quotes + texts (.zip)", data=zip_bytes, file_name="Hotel_Quinto_Quotes.zip", mime="application/zip")
+
+
 # ---------- Streamlit App ----------
 st.set_page_config(page_title="Hotel Quinto – Booking Calculator", page_icon="🎁", layout="centered")
 
@@ -170,33 +380,19 @@ def main():
         )
 
         # Build a human-friendly quote text
-        def fmt_cop(n: int) -> str:
-            return f"{n:,.0f}".replace(",", ".")
-        def fmt_usd(n: float) -> str:
-            return f"{n:,.2f}"
-
-        quote_text = (
-            "Booking Quote — Hotel Quinto\n"
-            f"Guests: {result['guests']}, Nights: {result['nights']}\n"
-            f"Base Rate: USD {fmt_usd(result['usd_per_person'])} per person per night\n"
-            f"Estimated Total: USD {fmt_usd(result['total_usd'])} (≈ {fmt_cop(result['total_cop'])} COP)\n"
-            f"Rate: 1 USD ≈ {fmt_cop(int(round(result['fx_rate'])))} COP (as of {result['asof_str']})\n"
+        quote_text = build_quote_text(
+            result["guests"], result["nights"], result["usd_per_person"],
+            result["total_usd"], result["total_cop"], result["fx_rate"], result["asof_str"],
         )
 
         st.divider()
         st.subheader("Share this quote")
 
         # WhatsApp deep link
-        wa_msg = (
-            f"Hello Hotel Quinto 👋, I’d like to book {result['guests']} guest"
-            f"{'s' if result['guests']!=1 else ''} for {result['nights']} night"
-            f"{'s' if result['nights']!=1 else ''}. "
-            f"Estimated total: USD {fmt_usd(result['total_usd'])} "
-            f"(≈ {fmt_cop(result['total_cop'])} COP). "
-            f"Rate: 1 USD ≈ {fmt_cop(int(round(result['fx_rate'])))} COP ({result['asof_str']})."
+        wa_url = build_wa_url(
+            result["guests"], result["nights"], result["total_usd"], result["total_cop"],
+            result["fx_rate"], result["asof_str"],
         )
-        wa_url = f"https://wa.me/{SETTINGS_WHATSAPP.replace('+','')}" \
-                 f"?text={urlquote(wa_msg)}"
 
         colA, colB = st.columns(2)
         with colA:
@@ -213,6 +409,8 @@ def main():
         with st.expander("Preview / Copy text"):
             st.code(quote_text)
 
+    batch_quotes_ui()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,43 @@
+"""
+Tiny side-port HTTP endpoints (Prometheus /metrics, warm-up /ready), served
+from a daemon thread next to Streamlit. One server per port per process, so
+Streamlit reruns can call serve() again safely.
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_servers = {}
+_lock = threading.Lock()
+
+
+def serve(port: int, path: str, respond, host: str = "0.0.0.0", name: str = "http-endpoint") -> bool:
+    """
+    Answer GET `path` (and "/") on `port` with respond() -> (status, content_type, body_str).
+    Returns False if the port is taken by something else.
+    """
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", path):
+                self.send_error(404)
+                return
+            status, content_type, body = respond()
+            body = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    with _lock:
+        if port in _servers:
+            return True
+        try:
+            server = ThreadingHTTPServer((host, port), _Handler)
+        except OSError:
+            return False
+        _servers[port] = server
+    threading.Thread(target=server.serve_forever, name=name, daemon=True).start()
+    return True
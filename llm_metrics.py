@@ -0,0 +1,214 @@
+"""
+In-process usage and latency metrics for the chat path.
+
+chat_pipeline records every answered question (outcome, language, latency)
+and every upstream LLM call (model, time to first byte, total latency,
+prompt/completion tokens). Counters and histograms are rendered in the
+Prometheus text format, either written to a file for a textfile collector
+or served on a small HTTP port, together with an estimated USD cost per day
+for the last few days (from MODEL_PRICES).
+"""
+import os
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import http_endpoint
+
+PREFIX = "hotelquinto"
+
+# Seconds; chat answers range from microseconds (cache) to tens of seconds (LLM)
+LATENCY_BUCKETS = (0.005, 0.025, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0)
+
+# USD per 1M tokens (prompt, completion). Overridden from settings.MODEL_PRICES by app.py.
+DEFAULT_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+}
+
+COST_DAYS = 7
+
+
+class _Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        # Bucket counts are cumulative, as Prometheus expects
+        self.sum += value
+        self.count += 1
+        for i, b in enumerate(self.buckets):
+            if value <= b:
+                self.counts[i] += 1
+
+
+def _labels(**kw) -> str:
+    def esc(v):
+        return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in kw.items()) + "}"
+
+
+class Metrics:
+    def __init__(self, prices=None):
+        self._lock = threading.Lock()
+        self.prices = dict(DEFAULT_PRICES)
+        if prices:
+            self.prices.update(prices)
+        self.reset()
+
+    def configure(self, prices):
+        with self._lock:
+            self.prices.update(prices or {})
+
+    def reset(self):
+        with self._lock:
+            self._requests = {}      # (outcome, lang) -> count
+            self._request_hist = {}  # outcome -> _Histogram
+            self._calls = {}         # (model, lang, status) -> count
+            self._ttfb_hist = {}     # model -> _Histogram
+            self._call_hist = {}     # model -> _Histogram
+            self._tokens = {}        # (model, kind) -> count
+            self._cost = {}          # model -> USD
+            self._cost_by_day = {}   # ISO day -> USD
+            self.version = 0
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        p_in, p_out = self.prices.get(model, (0.0, 0.0))
+        return (prompt_tokens * p_in + completion_tokens * p_out) / 1_000_000
+
+    # ── recording ─────────────────────────────────────────────────────────
+    def record_request(self, outcome: str, lang: str, latency_ms: float):
+        """One answered (or failed) chat question; outcome is the route or "error"."""
+        with self._lock:
+            key = (outcome, lang)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            self._request_hist.setdefault(outcome, _Histogram()).observe(latency_ms / 1000)
+            self.version += 1
+
+    def record_call(self, model: str, lang: str, latency_ms: float, ttfb_ms=None,
+                    prompt_tokens: int = 0, completion_tokens: int = 0, ok: bool = True):
+        """One upstream chat.completions call."""
+        usd = self.cost(model, prompt_tokens, completion_tokens)
+        day = date.today().isoformat()
+        with self._lock:
+            key = (model, lang, "ok" if ok else "error")
+            self._calls[key] = self._calls.get(key, 0) + 1
+            self._call_hist.setdefault(model, _Histogram()).observe(latency_ms / 1000)
+            if ttfb_ms is not None:
+                self._ttfb_hist.setdefault(model, _Histogram()).observe(ttfb_ms / 1000)
+            for kind, n in (("prompt", prompt_tokens), ("completion", completion_tokens)):
+                if n:
+                    self._tokens[(model, kind)] = self._tokens.get((model, kind), 0) + n
+            self._cost[model] = self._cost.get(model, 0.0) + usd
+            self._cost_by_day[day] = self._cost_by_day.get(day, 0.0) + usd
+            # Rolling window: forget days older than COST_DAYS
+            oldest = (date.today() - timedelta(days=COST_DAYS - 1)).isoformat()
+            for d in [d for d in self._cost_by_day if d < oldest]:
+                del self._cost_by_day[d]
+            self.version += 1
+
+    def cost_by_day(self) -> dict:
+        """Estimated LLM spend in USD per day (last COST_DAYS days, oldest first)."""
+        with self._lock:
+            return dict(sorted(self._cost_by_day.items()))
+
+    # ── exposition ────────────────────────────────────────────────────────
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+
+        def head(name, kind, help_):
+            lines.append(f"# HELP {PREFIX}_{name} {help_}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+
+        def hist(name, label, series):
+            for value, h in sorted(series.items()):
+                for b, c in zip(h.buckets, h.counts):
+                    lines.append(f"{PREFIX}_{name}_bucket{_labels(**{label: value, 'le': f'{b:g}'})} {c}")
+                lines.append(f"{PREFIX}_{name}_bucket{_labels(**{label: value, 'le': '+Inf'})} {h.count}")
+                lines.append(f"{PREFIX}_{name}_sum{_labels(**{label: value})} {h.sum:.6f}")
+                lines.append(f"{PREFIX}_{name}_count{_labels(**{label: value})} {h.count}")
+
+        today = date.today().isoformat()
+        with self._lock:
+            head("chat_requests_total", "counter", "Chat questions answered, by outcome and language.")
+            for (outcome, lang), n in sorted(self._requests.items()):
+                lines.append(f"{PREFIX}_chat_requests_total{_labels(outcome=outcome, lang=lang)} {n}")
+            head("chat_latency_seconds", "histogram", "End-to-end answer latency by outcome.")
+            hist("chat_latency_seconds", "outcome", self._request_hist)
+
+            head("llm_calls_total", "counter", "Upstream LLM calls by model, language and status.")
+            for (model, lang, status), n in sorted(self._calls.items()):
+                lines.append(f"{PREFIX}_llm_calls_total{_labels(model=model, lang=lang, status=status)} {n}")
+            head("llm_ttfb_seconds", "histogram", "Time to first streamed chunk of an LLM call.")
+            hist("llm_ttfb_seconds", "model", self._ttfb_hist)
+            head("llm_latency_seconds", "histogram", "Total LLM call latency.")
+            hist("llm_latency_seconds", "model", self._call_hist)
+
+            head("llm_tokens_total", "counter", "Tokens reported by the API, by model and kind.")
+            for (model, kind), n in sorted(self._tokens.items()):
+                lines.append(f"{PREFIX}_llm_tokens_total{_labels(model=model, kind=kind)} {n}")
+            head("llm_cost_usd_total", "counter", "Estimated LLM spend since process start.")
+            for model, usd in sorted(self._cost.items()):
+                lines.append(f"{PREFIX}_llm_cost_usd_total{_labels(model=model)} {usd:.6f}")
+            head("llm_cost_usd_day", "gauge", f"Estimated LLM spend per day (last {COST_DAYS} days).")
+            for day, usd in sorted(self._cost_by_day.items()):
+                lines.append(f"{PREFIX}_llm_cost_usd_day{_labels(day=day)} {usd:.6f}")
+            head("llm_cost_usd_today", "gauge", "Estimated LLM spend today.")
+            lines.append(f"{PREFIX}_llm_cost_usd_today {self._cost_by_day.get(today, 0.0):.6f}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Atomically write the exposition to `path` (for node_exporter's textfile collector)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+metrics = Metrics()
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Exporters (started once per process; Streamlit reruns call these again)
+# ──────────────────────────────────────────────────────────────────────────
+_exporters = {}
+_exporters_lock = threading.Lock()
+
+
+def export_to_file(path, interval: float = 15.0):
+    """Rewrite `path` every `interval` seconds when something changed."""
+    path = str(path)
+    with _exporters_lock:
+        if ("file", path) in _exporters:
+            return
+        _exporters[("file", path)] = True
+
+    def loop():
+        written = None
+        while True:
+            if metrics.version != written:
+                written = metrics.version
+                try:
+                    metrics.write(path)
+                except OSError:
+                    pass
+            time.sleep(interval)
+
+    threading.Thread(target=loop, name="llm-metrics-file", daemon=True).start()
+
+
+def serve(port: int, host: str = "0.0.0.0"):
+    """Serve /metrics on `port` from a daemon thread. Returns False if the port is taken."""
+    return http_endpoint.serve(
+        port,
+        "/metrics",
+        lambda: (200, "text/plain; version=0.0.4; charset=utf-8", metrics.render()),
+        host=host,
+        name="llm-metrics-http",
+    )
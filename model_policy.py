@@ -0,0 +1,115 @@
+"""
+Latency-aware model tiering for chat requests.
+
+Each request is classified as "fast", "standard" or "complex" from its
+length, intent and conversation depth, and gets that tier's model and
+max_tokens. Per-model time to first byte and error rates are tracked over a
+rolling window (TTFB, not total latency, so long answers from a healthy
+model don't look slow); when a tier's model is degraded the request moves
+to the nearest tier on a healthy model, keeping its own max_tokens, until
+the bad samples age out.
+"""
+import re
+import threading
+import time
+from collections import deque
+
+from text_utils import normalize_question
+
+# Cheapest/fastest first. Overridden from settings.MODEL_TIERS by app.py.
+DEFAULT_TIERS = [
+    {"name": "fast", "model": "gpt-4.1-nano", "max_tokens": 250},
+    {"name": "standard", "model": "gpt-4o-mini", "max_tokens": 700},
+    {"name": "complex", "model": "gpt-4o-mini", "max_tokens": 1000},
+]
+
+WINDOW_SECONDS = 300
+MIN_SAMPLES = 5
+MAX_ERROR_RATE = 0.3
+MAX_P50_TTFB_MS = 4000
+
+_SMALL_TALK_RE = re.compile(
+    r"^(hi|hello|hey|hola|buenas|buenos dias|buenas tardes|buenas noches|thanks|thank you|gracias|"
+    r"ok|okay|vale|perfect|perfecto|great|genial|bye|adios|chao)( \w+)?$"
+)
+_NUM = r"(\d+|two|three|four|five|six|seven|dos|tres|cuatro|cinco|seis|siete)"
+# Itinerary/comparison phrasing only: "meal plan" or "what days is breakfast" are simple questions
+_COMPLEX_RE = re.compile(
+    r"\b(itinerary|itinerario|plan (a|an|my|our|the|un|una|mi|nuestro|nuestra)|planear|planificar|"
+    rf"{_NUM} (days?|dias?|nights?|noches?)|day trips?|several (days|places|towns)|"
+    r"(varios|varias) (dias|lugares|pueblos)|route|ruta|compare|comparar|versus|step by step|paso a paso)\b"
+)
+
+# Open-ended asks need room for a real answer even when the question is short
+_OPEN_ENDED_RE = re.compile(
+    r"\b(tips?|advice|recommend\w*|suggest\w*|explain|how do i|how can i|what to do|things to do|"
+    r"consejos?|trucos?|recomienda\w*|recomendaci\w*|sugiere\w*|como llego|que hacer)\b"
+)
+
+
+def classify(messages) -> str:
+    """Tier name for a chat request."""
+    question = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+    q = normalize_question(question)
+    words = len(q.split())
+    depth = sum(1 for m in messages if m.get("role") == "user")
+    if _COMPLEX_RE.search(q) or words > 40 or depth >= 4:
+        return "complex"
+    if _SMALL_TALK_RE.match(q) or (words <= 8 and depth == 1 and not _OPEN_ENDED_RE.search(q)):
+        return "fast"
+    return "standard"
+
+
+class ModelPolicy:
+    def __init__(self, tiers=None):
+        self._lock = threading.Lock()
+        self._samples = {}  # model -> deque of (timestamp, ttfb_ms, ok)
+        self.configure(tiers or DEFAULT_TIERS)
+
+    def configure(self, tiers):
+        with self._lock:
+            self.tiers = [dict(t) for t in tiers]
+
+    def record(self, model: str, ttfb_ms: float, ok: bool = True):
+        now = time.time()
+        with self._lock:
+            samples = self._samples.setdefault(model, deque(maxlen=500))
+            samples.append((now, ttfb_ms, ok))
+
+    def stats(self, model: str) -> dict:
+        """Rolling-window count, error rate and median TTFB for a model."""
+        cutoff = time.time() - WINDOW_SECONDS
+        with self._lock:
+            samples = [s for s in self._samples.get(model, ()) if s[0] >= cutoff]
+        if not samples:
+            return {"count": 0, "error_rate": 0.0, "p50_ms": 0.0}
+        latencies = sorted(s[1] for s in samples if s[2]) or [0.0]
+        return {
+            "count": len(samples),
+            "error_rate": sum(1 for s in samples if not s[2]) / len(samples),
+            "p50_ms": latencies[len(latencies) // 2],
+        }
+
+    def healthy(self, model: str) -> bool:
+        st_ = self.stats(model)
+        if st_["count"] < MIN_SAMPLES:
+            return True
+        return st_["error_rate"] <= MAX_ERROR_RATE and st_["p50_ms"] <= MAX_P50_TTFB_MS
+
+    def choose(self, messages) -> dict:
+        """Tier dict (name, model, max_tokens) to use for this request."""
+        tiers = self.tiers
+        wanted = classify(messages)
+        idx = next((i for i, t in enumerate(tiers) if t["name"] == wanted), len(tiers) // 2)
+        need = tiers[idx]["max_tokens"]
+        # Nearest tiers first, preferring the larger one on ties; a tier on the same
+        # unhealthy model fails the check too, so traffic really moves off that model
+        order = sorted(range(len(tiers)), key=lambda i: (abs(i - idx), -i))
+        for i in order:
+            if self.healthy(tiers[i]["model"]):
+                # Keep the requested budget so a failover never truncates the answer
+                return dict(tiers[i], max_tokens=max(tiers[i]["max_tokens"], need), requested=wanted)
+        return dict(tiers[idx], requested=wanted)
+
+
+policy = ModelPolicy()
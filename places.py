@@ -0,0 +1,327 @@
+"""
+Points of interest around Hotel Quinto.
+
+A small local dataset anchored at HOTEL_LAT/HOTEL_LON with haversine
+distances and typical drive times precomputed at import, a grid index for
+"what's near <point>" lookups and bilingual name/alias matching. Lets the
+chat answer "how far is X" / "what's near the hotel" without an LLM call and
+gives the LLM real numbers when it is called.
+Coordinates and drive times are approximate (good enough for guest advice).
+"""
+import math
+import re
+
+from text_utils import normalize_question
+
+HOTEL_LAT, HOTEL_LON = 4.57898411319599, -75.73419087522693
+HOTEL_MAPS_URL = f"https://www.google.com/maps?q={HOTEL_LAT},{HOTEL_LON}"
+
+# drive_min: typical door-to-door drive from the hotel by taxi/car
+POIS = [
+    {
+        "key": "axm",
+        "name_en": "El Edén International Airport (AXM)",
+        "name_es": "Aeropuerto Internacional El Edén (AXM)",
+        "aliases": ["axm", "airport", "aeropuerto", "el eden", "eden airport", "armenia airport",
+                    "aeropuerto de armenia", "aeropuerto armenia"],
+        "lat": 4.4528, "lon": -75.7664, "drive_min": 35,
+    },
+    {
+        "key": "armenia",
+        "name_en": "Armenia city centre",
+        "name_es": "Centro de Armenia",
+        "aliases": ["armenia", "armenia centro", "downtown armenia", "plaza de bolivar"],
+        "lat": 4.5339, "lon": -75.6811, "drive_min": 25,
+    },
+    {
+        "key": "armenia_terminal",
+        "name_en": "Armenia bus terminal",
+        "name_es": "Terminal de transportes de Armenia",
+        "aliases": ["bus terminal", "bus station", "terminal de transportes"],
+        "lat": 4.5255, "lon": -75.6882, "drive_min": 25,
+    },
+    {
+        "key": "montenegro",
+        "name_en": "Montenegro",
+        "name_es": "Montenegro",
+        "aliases": ["montenegro"],
+        "lat": 4.5660, "lon": -75.7510, "drive_min": 10,
+    },
+    {
+        "key": "circasia",
+        "name_en": "Circasia",
+        "name_es": "Circasia",
+        "aliases": ["circasia"],
+        "lat": 4.6186, "lon": -75.6364, "drive_min": 20,
+    },
+    {
+        "key": "parque_cafe",
+        "name_en": "Parque del Café (theme park)",
+        "name_es": "Parque del Café",
+        "aliases": ["parque del cafe", "coffee park", "national coffee park", "parque nacional del cafe"],
+        "lat": 4.5406, "lon": -75.7703, "drive_min": 15,
+    },
+    {
+        "key": "panaca",
+        "name_en": "PANACA (agricultural theme park)",
+        "name_es": "PANACA",
+        "aliases": ["panaca"],
+        "lat": 4.6358, "lon": -75.7632, "drive_min": 20,
+    },
+    {
+        "key": "quimbaya",
+        "name_en": "Quimbaya",
+        "name_es": "Quimbaya",
+        "aliases": ["quimbaya"],
+        "lat": 4.6236, "lon": -75.7628, "drive_min": 20,
+    },
+    {
+        "key": "filandia",
+        "name_en": "Filandia (town & Colina Iluminada viewpoint)",
+        "name_es": "Filandia (pueblo y mirador Colina Iluminada)",
+        "aliases": ["filandia", "colina iluminada", "mirador de filandia"],
+        "lat": 4.6747, "lon": -75.6583, "drive_min": 35,
+    },
+    {
+        "key": "salento",
+        "name_en": "Salento",
+        "name_es": "Salento",
+        "aliases": ["salento"],
+        "lat": 4.6376, "lon": -75.5703, "drive_min": 45,
+    },
+    {
+        "key": "el_ocaso",
+        "name_en": "Finca El Ocaso coffee farm (Salento)",
+        "name_es": "Finca El Ocaso, finca cafetera (Salento)",
+        "aliases": ["el ocaso", "finca el ocaso"],
+        "lat": 4.6290, "lon": -75.6010, "drive_min": 45,
+    },
+    {
+        "key": "cocora",
+        "name_en": "Cocora Valley (wax palms)",
+        "name_es": "Valle de Cocora (palmas de cera)",
+        "aliases": ["cocora", "valle de cocora", "cocora valley", "wax palms", "palma de cera", "palmas de cera"],
+        "lat": 4.6383, "lon": -75.4872, "drive_min": 65,
+    },
+    {
+        "key": "botanico",
+        "name_en": "Quindío Botanical Garden & Butterfly House (Calarcá)",
+        "name_es": "Jardín Botánico del Quindío y Mariposario (Calarcá)",
+        "aliases": ["botanical garden", "jardin botanico", "butterfly", "mariposario", "calarca"],
+        "lat": 4.5186, "lon": -75.6440, "drive_min": 35,
+    },
+    {
+        "key": "pei",
+        "name_en": "Matecaña International Airport, Pereira (PEI)",
+        "name_es": "Aeropuerto Internacional Matecaña, Pereira (PEI)",
+        "aliases": ["pei", "pereira", "matecana", "pereira airport", "aeropuerto de pereira",
+                    "aeropuerto pereira"],
+        "lat": 4.8127, "lon": -75.7395, "drive_min": 60,
+    },
+]
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Geometry & index (built once at import)
+# ──────────────────────────────────────────────────────────────────────────
+EARTH_RADIUS_KM = 6371.0088
+GRID_DEG = 0.05  # ~5.5 km cells
+NEARBY_RADIUS_KM = 15.0  # "what's near the hotel"
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _cell(lat, lon):
+    return (math.floor(lat / GRID_DEG), math.floor(lon / GRID_DEG))
+
+
+_GRID = {}
+for _p in POIS:
+    _p["km"] = round(haversine_km(HOTEL_LAT, HOTEL_LON, _p["lat"], _p["lon"]), 1)
+    _GRID.setdefault(_cell(_p["lat"], _p["lon"]), []).append(_p)
+
+# Normalized alias -> POI, longest aliases first so "valle de cocora" beats "cocora"
+_ALIASES = sorted(
+    ((normalize_question(a), p) for p in POIS for a in p["aliases"] + [p["name_en"], p["name_es"]]),
+    key=lambda item: -len(item[0]),
+)
+
+
+def nearby(lat, lon, radius_km: float):
+    """POIs within radius_km of (lat, lon), nearest first, as (km, poi) pairs."""
+    dlat = radius_km / 111.0
+    dlon = radius_km / (111.0 * max(math.cos(math.radians(lat)), 0.01))
+    (r0, c0), (r1, c1) = _cell(lat - dlat, lon - dlon), _cell(lat + dlat, lon + dlon)
+    hits = []
+    for r in range(r0, r1 + 1):
+        for c in range(c0, c1 + 1):
+            for p in _GRID.get((r, c), ()):
+                km = haversine_km(lat, lon, p["lat"], p["lon"])
+                if km <= radius_km:
+                    hits.append((km, p))
+    return sorted(hits, key=lambda h: h[0])
+
+
+def find_pois(text: str):
+    """POIs mentioned in free text (English or Spanish names/aliases)."""
+    q = f" {normalize_question(text)} "
+    found = []
+    for alias, p in _ALIASES:
+        if f" {alias} " in q and p not in found:
+            found.append(p)
+            q = q.replace(f" {alias} ", " ")
+    return found
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Question routing
+# ──────────────────────────────────────────────────────────────────────────
+_DISTANCE_RE = re.compile(
+    r"\b(how far|distance|how much time|how many (km|kilometers|miles|minutes)|drive time|"
+    r"que tan lejos|a que distancia|distancia|cuanto tiempo|cuantos (km|kilometros|minutos)|"
+    r"cuanto se demora|queda lejos|esta lejos)\b"
+)
+_LOCATION_RE = re.compile(r"\b(where|location|located|map|maps|address|donde|ubicacion|ubicado|mapa|direccion)\b")
+_NEARBY_RE = re.compile(r"\b(near|nearby|close to|around the hotel|cerca|cercanos?|alrededor)\b")
+# The whole question is "what's near the hotel": the only nearby ask answered with our list.
+# "restaurants near the hotel" names something we don't track, so it goes to the LLM.
+_NEARBY_ONLY_RE = re.compile(
+    r"^(what s|what is|whats|que hay) (near|nearby|around|close to|cerca (de|del)|alrededor (de|del)) "
+    r"(the |el )?hotel( quinto)?$"
+)
+# "near the hotel" / "cerca del hotel": anchors a named place's distance to the hotel
+_HOTEL_ANCHOR_RE = re.compile(
+    r"\b(near|nearby|close to|around|cerca (de|del)|alrededor (de|del))( the| el| hotel)? (hotel|quinto)\b"
+)
+# Looking for a kind of place (supermarket, ATM, restaurants) rather than asking about
+# distances: our list can't answer that, so it goes to the LLM
+_LOOKING_FOR_RE = re.compile(r"\b(is there|are there|any|(?<!que )hay|existe|algun|alguna|algunos|algunas)\b")
+# Anything beyond distance/time (prices, tips, recommendations) goes to the LLM, grounded
+_OTHER_ASK_RE = re.compile(
+    r"\b(price|cost|how much(?! time)|fare|recommend|tour|tours|tips?|best|book|precio|cuesta|cuanto vale|"
+    r"tarifa|recomienda|recomendacion|recomendaciones|mejor|reserv)\w*"
+)
+
+
+def poi_name(p, lang: str) -> str:
+    return p["name_es"] if lang == "Español" else p["name_en"]
+
+
+def directions_url(p) -> str:
+    return (
+        f"https://www.google.com/maps/dir/?api=1&origin={HOTEL_LAT},{HOTEL_LON}"
+        f"&destination={p['lat']},{p['lon']}"
+    )
+
+
+def _km_str(km, lang):
+    s = f"{km:.1f}"
+    return s.replace(".", ",") if lang == "Español" else s
+
+
+def _distance_line(p, lang):
+    if lang == "Español":
+        return (
+            f"**{poi_name(p, lang)}**: unos {_km_str(p['km'], lang)} km en línea recta, "
+            f"normalmente ~{p['drive_min']} min en carro. [Cómo llegar]({directions_url(p)})"
+        )
+    return (
+        f"**{poi_name(p, lang)}**: about {_km_str(p['km'], lang)} km in a straight line, "
+        f"typically ~{p['drive_min']} min by car. [Directions]({directions_url(p)})"
+    )
+
+
+def answer_place_question(text: str, lang: str, limit: int = 6):
+    """
+    Direct answer for pure "how far is X" / "what's near the hotel" questions,
+    or None when the question needs the LLM.
+    """
+    q = normalize_question(text)
+    if not q or _OTHER_ASK_RE.search(q):
+        return None
+    if _LOOKING_FOR_RE.search(q):
+        return None
+    pois = find_pois(q)
+    if pois and (_DISTANCE_RE.search(q) or _HOTEL_ANCHOR_RE.search(q)):
+        if lang == "Español":
+            head = "Distancias aproximadas desde Hotel Quinto:"
+        else:
+            head = "Approximate distances from Hotel Quinto:"
+        lines = [_distance_line(p, lang) for p in pois]
+    elif not pois and _NEARBY_ONLY_RE.match(q):
+        if lang == "Español":
+            head = f"Lugares a menos de {NEARBY_RADIUS_KM:g} km de Hotel Quinto (más cercanos primero):"
+        else:
+            head = f"Places within {NEARBY_RADIUS_KM:g} km of Hotel Quinto (closest first):"
+        lines = [_distance_line(p, lang) for _, p in nearby(HOTEL_LAT, HOTEL_LON, NEARBY_RADIUS_KM)[:limit]]
+    else:
+        return None
+    return "\n".join([head, ""] + [f"- {line}" for line in lines])
+
+
+def place_context(text: str):
+    """
+    System note with real distances for the LLM when a question mentions
+    places or travel, so it stops guessing (and uses our exact map pin).
+    """
+    q = normalize_question(text)
+    pois = find_pois(q)
+    travel = bool(_DISTANCE_RE.search(q) or _NEARBY_RE.search(q))
+    pin = f"Hotel Quinto map pin: {HOTEL_MAPS_URL} (use this exact link for the hotel location)."
+    if not pois and not travel:
+        return pin if _LOCATION_RE.search(q) else None
+    pois = pois or [p for _, p in nearby(HOTEL_LAT, HOTEL_LON, NEARBY_RADIUS_KM)[:6]]
+    facts = "; ".join(
+        f"{p['name_en']}: {p['km']:.1f} km straight line, ~{p['drive_min']} min drive" for p in pois
+    )
+    return f"{pin} Approximate distances from the hotel — {facts}."
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Routing self-check:  python places.py
+# ──────────────────────────────────────────────────────────────────────────
+# (question, expected) where expected is "distances", "nearby" or None (goes to the LLM)
+ROUTING_CASES = [
+    ("how far is Salento from the hotel", "distances"),
+    ("¿A qué distancia queda el Valle de Cocora?", "distances"),
+    ("Salento near the hotel?", "distances"),
+    ("distance from Pereira airport", "distances"),
+    ("how far is the hotel from Armenia airport", "distances"),
+    ("What's near the hotel?", "nearby"),
+    ("¿Qué hay cerca del hotel?", "nearby"),
+    ("restaurants near the hotel?", None),
+    ("pharmacy near the hotel", None),
+    ("supermarket near hotel quinto", None),
+    ("¿Qué restaurantes hay cerca del hotel?", None),
+    ("is there an ATM near the hotel?", None),
+    ("how long is the drive from the airport and how much is a taxi?", None),
+    ("how long do I need in Salento?", None),
+]
+
+
+def _route(text: str):
+    answer = answer_place_question(text, "English")
+    if answer is None:
+        return None
+    return "nearby" if answer.startswith("Places within") else "distances"
+
+
+if __name__ == "__main__":
+    import sys
+
+    failed = 0
+    for question, expected in ROUTING_CASES:
+        got = _route(question)
+        failed += got != expected
+        print(f"{'ok  ' if got == expected else 'FAIL'} {question!r}: {got} (expected {expected})")
+    extra = {"distance from Pereira airport": ["pei"], "how far is the hotel from Armenia airport": ["axm"]}
+    for question, keys in extra.items():
+        got = [p["key"] for p in find_pois(question)]
+        failed += got != keys
+        print(f"{'ok  ' if got == keys else 'FAIL'} find_pois({question!r}): {got} (expected {keys})")
+    sys.exit(1 if failed else 0)
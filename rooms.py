@@ -0,0 +1,68 @@
+"""
+Room catalogue for Hotel Quinto.
+Kept free of Streamlit imports so scripts (benchmarks, asset checks) can use it.
+"""
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent
+ASSETS = BASE_DIR / "assets"
+
+# Room data (all paths as lists for consistency)
+ROOMS_DATA = [
+    {
+        "key": "standard",
+        "keywords": ["standard", "estandar", "estándar", "single"],
+        "paths": [str(ASSETS / "standard.jpg"), str(ASSETS / "standard2.jpg")],
+        "caption_en": "Standard — 1 double bed, bamboo style, bathroom across the hall",
+        "caption_es": "Estándar — 1 cama doble, estilo bambú, baño al frente",
+        "capacity": 2,
+    },
+    {
+        "key": "downstairs",
+        "keywords": ["downstairs", "abajo"],
+        "paths": [str(ASSETS / "stairs-bedroom-downstairs.jpg")],
+        "caption_en": "Downstairs Bedroom — Cozy room on the lower floor",
+        "caption_es": "Habitación de abajo — Habitación acogedora en la planta baja",
+        "capacity": 3,
+    },
+    {
+        "key": "upstairs",
+        "keywords": ["upstairs", "arriba"],
+        "paths": [str(ASSETS / "upstairs-bedroom.jpg")],
+        "caption_en": "Upstairs Room — Bright with views",
+        "caption_es": "Habitación de arriba — Luminosa con vistas",
+        "capacity": 3,
+    },
+    {
+        "key": "threebed",
+        "keywords": ["three", "triple", "tres"],
+        "paths": [str(ASSETS / "three-bed-room.jpg")],
+        "caption_en": "Three-Bedroom — Spacious with multiple beds",
+        "caption_es": "Habitación triple — Amplia con varias camas",
+        "capacity": 4,
+    },
+    {
+        "key": "fourbed",
+        "keywords": ["four", "cuatro", "quad"],
+        "paths": [str(ASSETS / "four-bed.jpg")],
+        "caption_en": "Four-Bedroom — Large with room for groups",
+        "caption_es": "Habitación de cuatro camas — Grande para grupos",
+        "capacity": 5,
+    },
+]
+
+ROOM_GENERIC_TRIGGERS = ["room", "rooms", "habitacion", "habitaciones"]
+
+
+def match_rooms_from_text(text: str):
+    t = (text or "").lower()
+    matched = [r for r in ROOMS_DATA if any(k in t for k in r["keywords"])]
+    if matched:
+        return matched
+    if any(k in t for k in ROOM_GENERIC_TRIGGERS):
+        return ROOMS_DATA
+    return []
+
+
+def room_caption(r, lang: str) -> str:
+    return r["caption_es"] if lang == "Español" else r["caption_en"]
@@ -1,19 +1,49 @@
 # settings.py
+#
+# Values are read into an immutable, versioned snapshot (current()). A
+# watchdog observer (watch()) marks it stale when .env or SETTINGS_FILE
+# changes and the next current() call re-reads them, so a rate or promo edit
+# takes effect without restarting the service. Precedence, highest first:
+# SETTINGS_FILE, real environment variables (Render Env Vars), .env.
+# The module-level constants mirror the latest snapshot for
+# `from settings import X` callers.
+import hashlib
+import json
 import os
+import sys
+import threading
 from datetime import datetime, timezone
-from dotenv import load_dotenv
+from pathlib import Path
+from types import MappingProxyType
+from dotenv import dotenv_values, load_dotenv
 import requests
 
-# Load .env for local runs (Render uses Env Vars)
-load_dotenv(override=False)
+from file_watch import watch_paths
+
+BASE_DIR = Path(__file__).parent
+ENV_FILE = BASE_DIR / ".env"
+# Optional live-editable file in .env format (e.g. a mounted secret file)
+SETTINGS_FILE = os.getenv("SETTINGS_FILE", "")
+
+def _file_env(path) -> dict:
+    if not path or not Path(path).is_file():
+        return {}
+    return {k: v for k, v in dotenv_values(path).items() if v is not None}
+
+# Real environment, recorded before .env is loaded. This is the only
+# load_dotenv() in the app, so import settings before anything reads .env.
+_PROCESS_ENV = dict(os.environ)
+
+# Load .env for local runs (Render uses Env Vars); other modules still read os.environ
+load_dotenv(ENV_FILE, override=False)
 
 # ---------- Helpers ----------
-def _env_list(key: str, default: str = ""):
-    raw = os.getenv(key, default)
+def _env_list(getenv, key: str, default: str = ""):
+    raw = getenv(key, default)
     return [s.strip() for s in raw.split(",") if s.strip()]
 
-def _env_promos(key: str, default: str = ""):
-    raw = os.getenv(key, default)
+def _env_promos(getenv, key: str, default: str = ""):
+    raw = getenv(key, default)
     promos = {}
     for chunk in raw.split(";"):
         if ":" in chunk:
@@ -21,51 +51,207 @@ def _env_promos(key: str, default: str = ""):
             promos[code.strip()] = desc.strip()
     return promos
 
-# ---------- Identity ----------
-HOTEL_NAME = os.getenv("HOTEL_NAME", "Hotel Quinto")
-OFFICIAL_EMAIL = os.getenv("OFFICIAL_EMAIL", "info@hotelquinto.com")
-WHATSAPP_E164 = os.getenv("WHATSAPP_E164", "")
-
-# ---------- Booking ----------
-USD_RATE = float(os.getenv("USD_RATE", "26"))
-CHECKIN = os.getenv("CHECKIN", "15:00")
-CHECKOUT = os.getenv("CHECKOUT", "11:00")
-
-# ---------- Payments & Promos ----------
-ACCEPTED_PAYMENTS = _env_list(
-    "ACCEPTED_PAYMENTS",
-    "Cash (COP), Nequi, Bancolombia Transfer",
-)
-PROMOS = _env_promos(
-    "PROMOS",
-    "WEEKLY10:10% off stays of 7+ nights;STAY3PAY2:Stay 3 nights, pay 2",
-)
-
-# ---------- FX ----------
-USD_TO_COP_FALLBACK = float(os.getenv("USD_TO_COP_FALLBACK", "3900"))
-FX_PROVIDER = os.getenv("FX_PROVIDER", "exchangerate_host").lower()
-OXR_APP_ID = os.getenv("OXR_APP_ID", "")
-FX_TIMEOUT_SECONDS = int(os.getenv("FX_TIMEOUT_SECONDS", "4"))
+def _env_tiers(getenv, key: str, default: str = ""):
+    # "fast=gpt-4.1-nano:250;standard=gpt-4o-mini:700" -> ordered list of tier dicts
+    raw = getenv(key, default)
+    tiers = []
+    for chunk in raw.split(";"):
+        if "=" in chunk and ":" in chunk:
+            name, spec = chunk.split("=", 1)
+            model, max_tokens = spec.rsplit(":", 1)
+            tiers.append({"name": name.strip(), "model": model.strip(), "max_tokens": int(max_tokens)})
+    return tiers
+
+def _env_prices(getenv, key: str, default: str = ""):
+    # "gpt-4o-mini=0.15:0.60" -> {"gpt-4o-mini": (0.15, 0.60)} (USD per 1M prompt/completion tokens)
+    raw = getenv(key, default)
+    prices = {}
+    for chunk in raw.split(";"):
+        if "=" in chunk and ":" in chunk:
+            model, spec = chunk.split("=", 1)
+            p_in, p_out = spec.split(":", 1)
+            prices[model.strip()] = (float(p_in), float(p_out))
+    return prices
+
+def _read(env) -> dict:
+    getenv = env.get
+
+    # ---------- Identity ----------
+    HOTEL_NAME = getenv("HOTEL_NAME", "Hotel Quinto")
+    OFFICIAL_EMAIL = getenv("OFFICIAL_EMAIL", "info@hotelquinto.com")
+    WHATSAPP_E164 = getenv("WHATSAPP_E164", "")
+
+    # ---------- Booking ----------
+    USD_RATE = float(getenv("USD_RATE", "26"))
+    CHECKIN = getenv("CHECKIN", "15:00")
+    CHECKOUT = getenv("CHECKOUT", "11:00")
+
+    # Blocked dates per room (load a CSV with: python availability.py import file.csv)
+    AVAILABILITY_DB = getenv("AVAILABILITY_DB", "data/availability.sqlite3")
+
+    # ---------- Payments & Promos ----------
+    ACCEPTED_PAYMENTS = _env_list(
+        getenv,
+        "ACCEPTED_PAYMENTS",
+        "Cash (COP), Nequi, Bancolombia Transfer",
+    )
+    PROMOS = _env_promos(
+        getenv,
+        "PROMOS",
+        "WEEKLY10:10% off stays of 7+ nights;STAY3PAY2:Stay 3 nights, pay 2",
+    )
+
+    # ---------- Media ----------
+    # Serve photos from static/ by URL (needs server.enableStaticServing) instead of
+    # pushing image bytes through Streamlit's media pipeline on every render.
+    SERVE_STATIC_IMAGES = getenv("SERVE_STATIC_IMAGES", "true").strip().lower() in ("1", "true", "yes")
+
+    # ---------- Chat models ----------
+    # Fastest/cheapest tier first; model_policy picks one per request by complexity/health
+    MODEL_TIERS = _env_tiers(
+        getenv,
+        "MODEL_TIERS",
+        "fast=gpt-4.1-nano:250;standard=gpt-4o-mini:700;complex=gpt-4o-mini:1000",
+    )
+
+    # USD per 1M tokens (prompt:completion), for the daily cost estimate in llm_metrics
+    MODEL_PRICES = _env_prices(
+        getenv,
+        "MODEL_PRICES",
+        "gpt-4o-mini=0.15:0.60;gpt-4.1-nano=0.10:0.40",
+    )
+
+    # ---------- Metrics ----------
+    # Prometheus text exposition of chat/LLM metrics: a file for a textfile
+    # collector (empty disables) and/or an HTTP port serving /metrics (0 disables).
+    METRICS_PATH = getenv("METRICS_PATH", "data/metrics.prom")
+    METRICS_PORT = int(getenv("METRICS_PORT", "0"))
+    METRICS_INTERVAL_SECONDS = float(getenv("METRICS_INTERVAL_SECONDS", "15"))
+
+    # ---------- Warm-up ----------
+    # GET /ready on this port answers 503 until warmup.py has finished (0 disables)
+    READY_PORT = int(getenv("READY_PORT", "0"))
+
+    # ---------- Cache ----------
+    # "memory" keeps caches per process; "sqlite" shares them between processes
+    # (and instances, if CACHE_PATH sits on a shared volume).
+    CACHE_BACKEND = getenv("CACHE_BACKEND", "memory").strip().lower()
+    CACHE_PATH = getenv("CACHE_PATH", ".cache/hotel_quinto.sqlite3")
+    FX_CACHE_TTL_SECONDS = int(getenv("FX_CACHE_TTL_SECONDS", "3600"))
+    ANSWER_CACHE_TTL_SECONDS = int(getenv("ANSWER_CACHE_TTL_SECONDS", "86400"))
+
+    # ---------- FX ----------
+    USD_TO_COP_FALLBACK = float(getenv("USD_TO_COP_FALLBACK", "3900"))
+    FX_PROVIDER = getenv("FX_PROVIDER", "exchangerate_host").lower()
+    OXR_APP_ID = getenv("OXR_APP_ID", "")
+    FX_TIMEOUT_SECONDS = int(getenv("FX_TIMEOUT_SECONDS", "4"))
+
+    return {k: v for k, v in locals().items() if k.isupper()}
+
+# ---------- Snapshots ----------
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def _thaw(value):
+    if isinstance(value, MappingProxyType):
+        return dict(value)
+    raise TypeError(type(value).__name__)
+
+class Snapshot:
+    """Read-only settings at one version: S.USD_RATE, S.PROMOS (mapping), S.ACCEPTED_PAYMENTS (tuple)..."""
+    __slots__ = ("version", "_values")
+
+    def __init__(self, version: int, values: dict):
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "_values", MappingProxyType({k: _freeze(v) for k, v in values.items()}))
+
+    def __getattr__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        raise AttributeError("settings snapshots are read-only")
+
+    def fingerprint(self, *keys) -> str:
+        """Short hash of the given settings (all when empty). Use it in cache keys so an
+        entry goes stale only when a setting it was built from changes."""
+        picked = {k: self._values[k] for k in (keys or sorted(self._values))}
+        blob = json.dumps(picked, sort_keys=True, default=_thaw)
+        return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:10]
+
+_lock = threading.Lock()
+_current = None
+_stale = True
+
+def _env_now() -> dict:
+    env = _file_env(ENV_FILE)
+    env.update(_PROCESS_ENV)
+    env.update(_file_env(SETTINGS_FILE))
+    return env
+
+def reload() -> Snapshot:
+    """
+    Re-read .env / SETTINGS_FILE. The version only moves when a value changed;
+    a bad value (e.g. USD_RATE=abc) keeps the previous snapshot.
+    """
+    global _current, _stale
+    with _lock:
+        _stale = False
+        try:
+            candidate = Snapshot(0, _read(_env_now()))
+        except ValueError as e:
+            if _current is None:
+                raise
+            print(f"[settings] reload skipped: {e}", file=sys.stderr)
+            return _current
+        if _current is not None and candidate.fingerprint() == _current.fingerprint():
+            return _current
+        _current = Snapshot(_current.version + 1 if _current else 1, dict(candidate._values))
+        globals().update(_current._values)
+        return _current
+
+def current() -> Snapshot:
+    """Latest snapshot; re-reads the files first if a watched one changed."""
+    if _stale or _current is None:
+        return reload()
+    return _current
+
+def invalidate():
+    global _stale
+    _stale = True
+
+def watch():
+    """Mark settings stale whenever .env or SETTINGS_FILE changes (needs watchdog)."""
+    watch_paths([ENV_FILE, SETTINGS_FILE], invalidate)
+
+reload()
 
 def fetch_usd_to_cop():
     """
     Returns (rate, timestamp).
     Uses live API if possible, otherwise falls back to USD_TO_COP_FALLBACK.
     """
+    S = current()
     try:
-        if FX_PROVIDER == "openexchangerates":
-            if not OXR_APP_ID:
+        if S.FX_PROVIDER == "openexchangerates":
+            if not S.OXR_APP_ID:
                 raise ValueError("OXR_APP_ID missing")
             url = (
-                f"https://openexchangerates.org/api/latest.json?app_id={OXR_APP_ID}&symbols=COP"
+                f"https://openexchangerates.org/api/latest.json?app_id={S.OXR_APP_ID}&symbols=COP"
             )
-            r = requests.get(url, timeout=FX_TIMEOUT_SECONDS)
+            r = requests.get(url, timeout=S.FX_TIMEOUT_SECONDS)
             r.raise_for_status()
             data = r.json()
             rate = float(data["rates"]["COP"])
-        elif FX_PROVIDER in ("exchangerate_host", "exchangeratehost"):
+        elif S.FX_PROVIDER in ("exchangerate_host", "exchangeratehost"):
             url = "https://api.exchangerate.host/latest?base=USD&symbols=COP"
-            r = requests.get(url, timeout=FX_TIMEOUT_SECONDS)
+            r = requests.get(url, timeout=S.FX_TIMEOUT_SECONDS)
             r.raise_for_status()
             data = r.json()
             rate = float(data["rates"]["COP"])
@@ -75,4 +261,4 @@ def fetch_usd_to_cop():
         ts = datetime.now(timezone.utc).isoformat()
         return rate, ts
     except Exception:
-        return float(USD_TO_COP_FALLBACK), datetime.now(timezone.utc).isoformat()
+        return float(S.USD_TO_COP_FALLBACK), datetime.now(timezone.utc).isoformat()
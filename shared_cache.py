@@ -0,0 +1,247 @@
+"""
+Pluggable cache for Hotel Quinto (FX rates, chat answers, ...).
+
+Two backends share one interface (get / set / delete / clear / get_or_compute):
+- MemoryCache: per-process, thread-safe, LRU-bounded.
+- SQLiteCache: a SQLite file in WAL mode on local or shared disk, so every
+  Streamlit process/instance pointed at the same file shares one warm cache.
+  get_or_compute takes a short lease row so only one process computes a
+  missing key while the others wait for its result.
+
+Values must be JSON-serializable (the SQLite backend stores JSON).
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+_MISS = object()
+
+
+class MemoryCache:
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()  # key -> (value, expires_at or None)
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get_or_compute(self, key, compute, ttl=None, lock_timeout: float = 30.0):
+        """Return the cached value or run compute() once per key; exceptions are not cached."""
+        value = self.get(key, _MISS)
+        if value is not _MISS:
+            return value
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        acquired = key_lock.acquire(timeout=lock_timeout)
+        try:
+            value = self.get(key, _MISS)
+            if value is not _MISS:
+                return value
+            value = compute()
+            self.set(key, value, ttl)
+            return value
+        finally:
+            if acquired:
+                key_lock.release()
+                with self._lock:
+                    if not key_lock.locked():
+                        self._key_locks.pop(key, None)
+
+
+class SQLiteCache:
+    POLL_SECONDS = 0.05
+    # Reads refresh accessed_at at most this often per key (approximate LRU)
+    TOUCH_SECONDS = 60
+
+    def __init__(self, path, namespace: str = "default", max_entries: int = 1024):
+        self.path = str(path)
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self._local = threading.local()
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        db = self._db()
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " ns TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " expires_at REAL, accessed_at REAL NOT NULL, PRIMARY KEY (ns, key))"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS cache_lru ON cache (ns, accessed_at)")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS leases ("
+            " ns TEXT NOT NULL, key TEXT NOT NULL, owner TEXT NOT NULL,"
+            " expires_at REAL NOT NULL, PRIMARY KEY (ns, key))"
+        )
+
+    def _db(self):
+        # One connection per thread; Streamlit serves sessions from several threads
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def get(self, key, default=None):
+        db = self._db()
+        now = time.time()
+        row = db.execute(
+            "SELECT value, expires_at, accessed_at FROM cache WHERE ns = ? AND key = ?", (self.namespace, key)
+        ).fetchone()
+        if row is None:
+            return default
+        value, expires_at, accessed_at = row
+        if expires_at is not None and expires_at <= now:
+            db.execute(
+                "DELETE FROM cache WHERE ns = ? AND key = ? AND expires_at <= ?", (self.namespace, key, now)
+            )
+            return default
+        # Approximate LRU: a hit only takes the write lock to refresh a stale
+        # accessed_at, so hot keys read by many processes stay read-only
+        if now - accessed_at >= self.TOUCH_SECONDS:
+            db.execute(
+                "UPDATE cache SET accessed_at = ? WHERE ns = ? AND key = ?", (now, self.namespace, key)
+            )
+        return json.loads(value)
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute(
+                "INSERT OR REPLACE INTO cache (ns, key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), now + ttl if ttl else None, now),
+            )
+            db.execute("DELETE FROM cache WHERE ns = ? AND expires_at <= ?", (self.namespace, now))
+            (count,) = db.execute("SELECT COUNT(*) FROM cache WHERE ns = ?", (self.namespace,)).fetchone()
+            if count > self.max_entries:
+                db.execute(
+                    "DELETE FROM cache WHERE ns = ? AND key IN ("
+                    " SELECT key FROM cache WHERE ns = ? ORDER BY accessed_at LIMIT ?)",
+                    (self.namespace, self.namespace, count - self.max_entries),
+                )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def delete(self, key):
+        self._db().execute("DELETE FROM cache WHERE ns = ? AND key = ?", (self.namespace, key))
+
+    def clear(self):
+        self._db().execute("DELETE FROM cache WHERE ns = ?", (self.namespace,))
+
+    def __len__(self):
+        (count,) = self._db().execute(
+            "SELECT COUNT(*) FROM cache WHERE ns = ?", (self.namespace,)
+        ).fetchone()
+        return count
+
+    def _acquire(self, key, owner, lease_seconds):
+        db = self._db()
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute(
+                "DELETE FROM leases WHERE ns = ? AND key = ? AND expires_at <= ?", (self.namespace, key, now)
+            )
+            cur = db.execute(
+                "INSERT OR IGNORE INTO leases (ns, key, owner, expires_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, owner, now + lease_seconds),
+            )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return cur.rowcount == 1
+
+    def _release(self, key, owner):
+        self._db().execute(
+            "DELETE FROM leases WHERE ns = ? AND key = ? AND owner = ?", (self.namespace, key, owner)
+        )
+
+    def get_or_compute(self, key, compute, ttl=None, lock_timeout: float = 30.0):
+        """
+        Return the cached value, or compute it in exactly one process/thread
+        while concurrent callers wait. A crashed owner's lease expires after
+        lock_timeout; callers that wait that long compute the value themselves.
+        Exceptions propagate and are not cached.
+        """
+        owner = f"{os.getpid()}:{threading.get_ident()}"
+        deadline = time.monotonic() + lock_timeout
+        while True:
+            value = self.get(key, _MISS)
+            if value is not _MISS:
+                return value
+            if self._acquire(key, owner, lock_timeout):
+                try:
+                    value = self.get(key, _MISS)
+                    if value is _MISS:
+                        value = compute()
+                        self.set(key, value, ttl)
+                    return value
+                finally:
+                    self._release(key, owner)
+            if time.monotonic() >= deadline:
+                return compute()
+            time.sleep(self.POLL_SECONDS)
+
+
+DEFAULT_SQLITE_PATH = ".cache/hotel_quinto.sqlite3"
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def get_cache(namespace: str = "default", backend: str = "memory", path=None, max_entries: int = 1024):
+    """
+    Process-wide cache for `namespace` on the given backend ("memory" or "sqlite").
+    Memoized, so app.py can call it on every Streamlit rerun and get the same instance.
+    """
+    backend = (backend or "memory").lower()
+    path = str(path or DEFAULT_SQLITE_PATH) if backend == "sqlite" else None
+    key = (namespace, backend, path)
+    with _registry_lock:
+        cache = _registry.get(key)
+        if cache is None:
+            if backend == "sqlite":
+                cache = SQLiteCache(path, namespace=namespace, max_entries=max_entries)
+            else:
+                cache = MemoryCache(max_entries=max_entries)
+            _registry[key] = cache
+        return cache
@@ -0,0 +1,57 @@
+"""
+Single-flight call coalescing: concurrent callers with the same key share
+one in-progress call instead of each starting their own.
+"""
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key, fn, timeout=None):
+        """
+        Run fn() for `key`, or wait for the call already running for it.
+        Returns (result, shared) where shared is True for callers that joined
+        someone else's call. fn's exception is raised in every caller; a
+        joiner that waits longer than `timeout` seconds gets TimeoutError
+        (the original call keeps running for the others).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call.done.set()
+            return call.result, False
+
+        if not call.done.wait(timeout):
+            raise TimeoutError(f"timed out after {timeout}s waiting for in-flight call")
+        if call.error is not None:
+            raise call.error
+        return call.result, True
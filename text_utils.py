@@ -0,0 +1,11 @@
+"""Text helpers shared by the chat pipeline and place lookup."""
+import re
+import unicodedata
+
+
+def normalize_question(text: str) -> str:
+    """Lowercase, strip accents/punctuation and collapse whitespace."""
+    t = unicodedata.normalize("NFKD", text or "")
+    t = "".join(c for c in t if not unicodedata.combining(c)).lower()
+    t = re.sub(r"[^\w\s]", " ", t)
+    return " ".join(t.split())
@@ -0,0 +1,229 @@
+"""
+Pre-traffic warm-up for a new Hotel Quinto process.
+
+Runs the expensive first-visit work in a thread pool and records how long
+each step took: heavy imports (openai, PIL, pandas), the asset manifest
+plus the served photo files (read into the OS page cache, and decoded too
+when st.image() renders them), both FX fetches into the shared cache, the
+availability index and a TLS handshake with the OpenAI API. Ready means
+every step has finished (a failed step is reported, not retried).
+
+    python warmup.py                 # warm up, print per-step timings
+    python warmup.py --json          # same, as JSON
+    python warmup.py serve [flags]   # warm up, then run app.py in this process
+                                     # (flags go to Streamlit, e.g. --server.port 8501)
+
+Start the service with `python warmup.py serve` (the platform start command),
+not plain `streamlit run app.py`: `serve` only opens the Streamlit port after
+warm-up, so a platform health check routes traffic to warm instances. Under
+plain `streamlit run`, app.py starts warm-up with the first session, and that
+guest waits for it. With READY_PORT set, GET /ready on that port answers 503
+while warming and 200 with the report afterwards.
+"""
+import io
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import http_endpoint
+import settings
+from rooms import BASE_DIR
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Steps (each returns a short detail string; exceptions mark the step failed)
+# ──────────────────────────────────────────────────────────────────────────
+def _warm_imports():
+    import numpy  # noqa: F401
+    import openai
+    import pandas  # noqa: F401
+    from PIL import Image
+
+    Image.init()
+    return f"openai {openai.__version__}, {len(Image.OPEN)} PIL decoders"
+
+
+def _warm_assets():
+    from asset_manifest import STATIC_IMG_DIR, display_path, get_manifest
+
+    # Builds or loads the manifest and publishes static/img/ (the real first-visit cost)
+    files = [e for e in get_manifest()["files"].values() if e.get("exists") and not e.get("error")]
+    # Static URLs are sent by Tornado as-is, so reading the bytes is all there is to warm.
+    # st.image(path) runs Image.open on every render (and would re-encode anything wider
+    # than 1460 px), so with static serving off the derivatives are decoded too.
+    static = settings.current().SERVE_STATIC_IMAGES
+    if static:
+        paths = [STATIC_IMG_DIR / e["url"].split("?")[0].rsplit("/", 1)[-1] for e in files if e.get("url")]
+    else:
+        paths = [display_path(e) for e in files]
+
+    def read(path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if not static:
+            from PIL import Image
+
+            with Image.open(io.BytesIO(data)) as img:
+                img.load()
+        return len(data)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        total = sum(pool.map(read, paths))
+    how = "read into the page cache" if static else "read and decoded"
+    return f"manifest ready, {len(paths)} served files ({total / 1e6:.1f} MB) {how}"
+
+
+def _warm_fx_open_er_api():
+    from fx import fetch_usd_to_cop
+
+    rate, as_of = fetch_usd_to_cop()
+    if "fallback" in str(as_of):
+        raise RuntimeError(f"unavailable; using the fallback rate {rate:,.0f}")
+    return f"{rate:,.2f} COP ({as_of})"
+
+
+def _warm_fx_exchangerate_host():
+    from fx import exchangerate_host_rate
+
+    rate = exchangerate_host_rate(0.0)
+    if not rate:
+        raise RuntimeError("unavailable; the converter will use its default rate")
+    return f"{rate:,.2f} COP"
+
+
+def _warm_availability():
+    from availability import get_store
+
+    store = get_store(BASE_DIR / settings.current().AVAILABILITY_DB)
+    today = date.today()
+    free = store.available_rooms(today, today + timedelta(days=1))
+    if not store.version():
+        return "index built, no blocked dates loaded yet"
+    return f"{len(free)} room(s) free tonight"
+
+
+def _warm_openai():
+    from chat_pipeline import get_openai_client
+
+    client = get_openai_client()
+    if client is None:
+        return "skipped (no OPENAI_API_KEY)"
+    tiers = settings.current().MODEL_TIERS
+    model = tiers[0]["model"] if tiers else "gpt-4o-mini"
+    # Cheap authenticated GET: opens the pooled HTTPS connection the chat will reuse
+    client.with_options(timeout=10, max_retries=0).models.retrieve(model)
+    return f"connected ({model})"
+
+
+STEPS = {
+    "imports": _warm_imports,
+    "assets": _warm_assets,
+    "fx_open_er_api": _warm_fx_open_er_api,
+    "fx_exchangerate_host": _warm_fx_exchangerate_host,
+    "availability": _warm_availability,
+    "openai_tls": _warm_openai,
+}
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Runner & readiness
+# ──────────────────────────────────────────────────────────────────────────
+_ready = threading.Event()
+_report = None
+_started = False
+_start_lock = threading.Lock()
+
+
+def _timed(name, fn):
+    start = time.perf_counter()
+    try:
+        detail, ok = fn(), True
+    except Exception as e:
+        detail, ok = f"{type(e).__name__}: {e}", False
+    return {"step": name, "ok": ok, "ms": round((time.perf_counter() - start) * 1000, 1), "detail": detail}
+
+
+def run(steps=None, max_workers=None) -> dict:
+    """Run every step in parallel; returns {"ok", "total_ms", "steps": [...]} and marks the process ready."""
+    global _report
+    steps = steps or STEPS
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers or len(steps), thread_name_prefix="warmup") as pool:
+        results = list(pool.map(lambda item: _timed(*item), steps.items()))
+    _report = {
+        "ok": all(r["ok"] for r in results),
+        "total_ms": round((time.perf_counter() - start) * 1000, 1),
+        "steps": results,
+    }
+    _ready.set()
+    return _report
+
+
+def start():
+    """Run warm-up once per process in a background thread (no-op if already started)."""
+    global _started
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=run, name="warmup", daemon=True).start()
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def wait(timeout=None) -> bool:
+    return _ready.wait(timeout)
+
+
+def report():
+    return _report
+
+
+def _readiness():
+    if not is_ready():
+        return 503, "application/json", json.dumps({"ready": False})
+    return 200, "application/json", json.dumps(_report)
+
+
+def serve_readiness(port: int, host: str = "0.0.0.0"):
+    """Answer GET /ready on `port` from a daemon thread. Returns False if the port is taken."""
+    return http_endpoint.serve(port, "/ready", _readiness, host=host, name="warmup-ready")
+
+
+def format_report(rep) -> str:
+    lines = [f"{r['step']:<22} {r['ms']:>9.1f} ms  {'ok  ' if r['ok'] else 'FAIL'}  {r['detail']}" for r in rep["steps"]]
+    lines.append(f"{'total (parallel)':<22} {rep['total_ms']:>9.1f} ms")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    global _started
+    argv = sys.argv[1:] if argv is None else argv
+    serve = bool(argv) and argv[0] == "serve"
+    ready_port = settings.current().READY_PORT
+    if ready_port:
+        serve_readiness(ready_port)
+    with _start_lock:
+        _started = True
+    rep = run()
+    print(json.dumps(rep, indent=2) if "--json" in argv else format_report(rep), file=sys.stderr if serve else sys.stdout)
+    if not serve:
+        return 0
+    # Same process, so app.py reuses the warmed modules, caches and OpenAI connection
+    from streamlit.web import cli as stcli
+
+    sys.argv = ["streamlit", "run", str(BASE_DIR / "app.py"), *argv[1:]]
+    return stcli.main()
+
+
+if __name__ == "__main__":
+    # Run through the importable module so app.py's `import warmup` sees this state
+    import warmup
+
+    sys.exit(warmup.main())